@@ -1,7 +1,7 @@
 # Home.py
 import streamlit as st  #for frontend
 from auth import authenticate_user, register_user  #for authentication
-from helpers import initialize_session_state #to store data real time
+from helpers import initialize_session_state, release_nlp_processor #to store data real time
 
 #to configure the page appers on the tab
 st.set_page_config(
@@ -64,8 +64,12 @@ def show_login_page():
                             st.error("User already exists!")
 
 def show_main_app():
+    #start loading the NLP models while the user is still on the home page
+    from backend.model_registry import start_background_warmup
+    start_background_warmup()
     with st.sidebar:
         if st.button("🚪 Logout", use_container_width=True):
+            release_nlp_processor()
             for key in list(st.session_state.keys()):
                 del st.session_state[key]
             st.rerun()  # This will trigger a rerun and show the login page
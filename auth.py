@@ -1,6 +1,5 @@
 # auth.py
 import streamlit as st
-from backend.database import Database
 
 #to check if the username and password exits in the database
 def authenticate_user(username, password):   
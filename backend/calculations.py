@@ -16,7 +16,7 @@ class Calculations:
         return gap
     
     @staticmethod
-    def calculate_compatibility_score(skill_analysis, resume_sentiment, job_desc_sentiment):
+    def calculate_compatibility_score(skill_analysis, resume_sentiment=None, job_desc_sentiment=None):
         # Simplified - just use skill match
         return skill_analysis['overall_match']
     
@@ -1,77 +1,368 @@
 # backend/database.py
 
+import hashlib
+import json
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
+
+DB_NAME = "skill_analyzer.db"
+
+# applied to every pooled connection
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -8000",
+    "PRAGMA foreign_keys = ON",
+)
+
+DEFAULT_USERS = [
+    ("admin", "admin123"),
+    ("user", "user123"),
+    ("demo", "demo123"),
+    ("john", "john123"),
+    ("sarah", "sarah123"),
+    ("mike", "mike123"),
+    ("lisa", "lisa123")
+]
+
+# schema migrations, applied in order and tracked with PRAGMA user_version
+MIGRATIONS = [
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+    ],
+    [
+        # resumes and job descriptions, stored once per distinct content
+        '''
+        CREATE TABLE IF NOT EXISTS documents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content_hash TEXT UNIQUE NOT NULL,
+            kind TEXT NOT NULL,
+            content TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS analyses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL REFERENCES users(id),
+            resume_id INTEGER NOT NULL REFERENCES documents(id),
+            job_desc_id INTEGER NOT NULL REFERENCES documents(id),
+            compatibility_score REAL NOT NULL,
+            high_match_count INTEGER NOT NULL,
+            partial_match_count INTEGER NOT NULL,
+            missing_count INTEGER NOT NULL,
+            result TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS analysis_skills (
+            analysis_id INTEGER NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+            skill TEXT NOT NULL,
+            tier TEXT NOT NULL,
+            resume_skill TEXT,
+            similarity REAL NOT NULL
+        )
+        ''',
+        # ids grow with time, so (user_id, id) serves newest-first history pages
+        "CREATE INDEX IF NOT EXISTS idx_analyses_user ON analyses (user_id, id)",
+        "CREATE INDEX IF NOT EXISTS idx_analyses_created_at ON analyses (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_analysis_skills_analysis ON analysis_skills (analysis_id, tier)",
+        "CREATE INDEX IF NOT EXISTS idx_analysis_skills_skill ON analysis_skills (skill, tier)",
+    ],
+    [
+        # inverted skill index over stored resumes, see backend/skill_index.py
+        '''
+        CREATE TABLE IF NOT EXISTS skill_postings (
+            skill TEXT PRIMARY KEY,
+            resume_ids BLOB NOT NULL
+        ) WITHOUT ROWID
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS indexed_resumes (
+            resume_id INTEGER PRIMARY KEY REFERENCES documents(id)
+        )
+        ''',
+    ],
+    [
+        # postings added since the last merge into skill_postings
+        '''
+        CREATE TABLE IF NOT EXISTS skill_postings_delta (
+            skill TEXT NOT NULL,
+            resume_id INTEGER NOT NULL,
+            PRIMARY KEY (skill, resume_id)
+        ) WITHOUT ROWID
+        ''',
+    ],
+    [
+        # e.g. the hash of the skill taxonomy the postings were extracted with
+        '''
+        CREATE TABLE IF NOT EXISTS skill_index_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        ) WITHOUT ROWID
+        ''',
+    ],
+]
+
+# statements are kept as constants so sqlite3's per-connection cache reuses them
+INSERT_DEFAULT_USER = "INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)"
+INSERT_USER = "INSERT INTO users (username, password) VALUES (?, ?)"
+SELECT_USER = "SELECT * FROM users WHERE username = ?"
+INSERT_DOCUMENT = "INSERT OR IGNORE INTO documents (content_hash, kind, content) VALUES (?, ?, ?)"
+SELECT_DOCUMENT_ID = "SELECT id FROM documents WHERE content_hash = ?"
+SELECT_DOCUMENTS = "SELECT id, content FROM documents WHERE id IN (SELECT value FROM json_each(?))"
+SELECT_DOCUMENT_IDS = "SELECT id FROM documents WHERE kind = ? ORDER BY id"
+INSERT_ANALYSIS = """
+    INSERT INTO analyses (user_id, resume_id, job_desc_id, compatibility_score,
+                          high_match_count, partial_match_count, missing_count, result)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+INSERT_ANALYSIS_SKILL = """
+    INSERT INTO analysis_skills (analysis_id, skill, tier, resume_skill, similarity)
+    VALUES (?, ?, ?, ?, ?)
+"""
+SELECT_HISTORY = """
+    SELECT id, created_at, compatibility_score, high_match_count, partial_match_count, missing_count
+    FROM analyses
+    WHERE user_id = ? AND id < ?
+    ORDER BY id DESC
+    LIMIT ?
+"""
+SELECT_MOST_MISSING = """
+    SELECT s.skill, COUNT(*) AS times_missing
+    FROM analyses a
+    JOIN analysis_skills s ON s.analysis_id = a.id AND s.tier = 'missing'
+    WHERE a.user_id = ?
+    GROUP BY s.skill
+    ORDER BY times_missing DESC, s.skill
+    LIMIT ?
+"""
+SELECT_ANALYSIS = "SELECT result FROM analyses WHERE id = ? AND user_id = ?"
+
+
+class ConnectionPool:
+    """A fixed-size pool of SQLite connections shared by every session."""
+
+    def __init__(self, db_name, size=8, timeout=30.0):
+        self.db_name = db_name
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_name,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=256
+        )
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        # pool exhausted, wait for a connection to come back
+        return self._idle.get(timeout=self.timeout)
+
+    @contextmanager
+    def connection(self):
+        conn = self._checkout()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+
+_pools = {}
+_migrated = set()
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_name=DB_NAME):
+    with _pools_lock:
+        pool = _pools.get(db_name)
+        if pool is None:
+            pool = _pools[db_name] = ConnectionPool(db_name)
+        return pool
+
+
+def _migrate(conn):
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+        for statement in statements:
+            conn.execute(statement)
+        if number == 1:
+            conn.executemany(INSERT_DEFAULT_USER, DEFAULT_USERS)
+        conn.execute(f"PRAGMA user_version = {number}")
+
 
 class Database:
-    def __init__(self):
-        self.db_name = "skill_analyzer.db"
+    def __init__(self, db_name=DB_NAME):
+        self.db_name = db_name
+        self.pool = get_pool(db_name)
         self._create_tables()
-    
+
     def _create_tables(self):
-        try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT UNIQUE NOT NULL,
-                    password TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            default_users = [
-                ("admin", "admin123"),
-                ("user", "user123"),
-                ("demo", "demo123"),
-                ("john", "john123"),
-                ("sarah", "sarah123"),
-                ("mike", "mike123"),
-                ("lisa", "lisa123")
-            ]
-            
-            for username, password in default_users:
-                try:
-                    cursor.execute(
-                        "INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)",
-                        (username, password)
-                    )
-                except:
-                    pass
-            
-            conn.commit()
-            conn.close()
-            print("✅ Database tables created/verified successfully")
-        except Exception as e:
-            print(f"❌ Error creating tables: {e}")
-    
+        # schema and seed data are applied once per process, not per session
+        with _pools_lock:
+            if self.db_name in _migrated:
+                return
+            try:
+                with self.pool.connection() as conn:
+                    _migrate(conn)
+                _migrated.add(self.db_name)
+                print("✅ Database tables created/verified successfully")
+            except Exception as e:
+                print(f"❌ Error creating tables: {e}")
+
     def add_user(self, username, password):
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO users (username, password) VALUES (?, ?)",
-                (username, password)
-            )
-            conn.commit()
-            conn.close()
+            with self.pool.connection() as conn:
+                conn.execute(INSERT_USER, (username, password))
             return True
         except sqlite3.IntegrityError:
             return False
         except Exception as e:
             return False
-    
+
     def get_user(self, username):
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM users WHERE username = ?",
-                (username,)
-            )
-            user = cursor.fetchone()
-            conn.close()
-            return user
+            with self.pool.connection() as conn:
+                return conn.execute(SELECT_USER, (username,)).fetchone()
         except Exception as e:
             print(f"Error getting user: {e}")
             return None
+    
+    def save_document(self, text, kind):
+        """Store a document once per distinct content; returns its id."""
+        try:
+            with self.pool.connection() as conn:
+                return self._save_document(conn, text, kind)
+        except Exception as e:
+            print(f"Error saving document: {e}")
+            return None
+    
+    def _save_document(self, conn, text, kind):
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        conn.execute(INSERT_DOCUMENT, (content_hash, kind, text))
+        return conn.execute(SELECT_DOCUMENT_ID, (content_hash,)).fetchone()[0]
+    
+    def get_documents(self, document_ids):
+        """Stored document texts keyed by id; unknown ids are left out."""
+        try:
+            with self.pool.connection() as conn:
+                return dict(conn.execute(SELECT_DOCUMENTS, (json.dumps([int(i) for i in document_ids]),)))
+        except Exception as e:
+            print(f"Error getting documents: {e}")
+            return {}
+    
+    def get_document_ids(self, kind):
+        """Ids of every stored document of one kind, ascending."""
+        try:
+            with self.pool.connection() as conn:
+                return [row[0] for row in conn.execute(SELECT_DOCUMENT_IDS, (kind,))]
+        except Exception as e:
+            print(f"Error getting document ids: {e}")
+            return []
+    
+    def save_analysis(self, user_id, resume_text, job_desc_text, analysis_results):
+        """Persist an analysis and its per-skill rows; returns the analysis id."""
+        from .skill_result import json_default  # numpy-backed, so not imported at login
+        skill_analysis = analysis_results["skill_analysis"]
+        try:
+            with self.pool.connection() as conn:
+                resume_id = self._save_document(conn, resume_text, "resume")
+                job_desc_id = self._save_document(conn, job_desc_text, "job_description")
+                cursor = conn.execute(INSERT_ANALYSIS, (
+                    user_id, resume_id, job_desc_id,
+                    float(analysis_results["compatibility_score"]),
+                    skill_analysis["high_match_count"],
+                    skill_analysis["partial_match_count"],
+                    skill_analysis["missing_count"],
+                    json.dumps(analysis_results, default=json_default)
+                ))
+                analysis_id = cursor.lastrowid
+                
+                rows = [(analysis_id, skill["job_skill"], "high", skill["resume_skill"], float(skill["similarity"]))
+                        for skill in skill_analysis["matched_skills"]]
+                rows += [(analysis_id, skill["job_skill"], "partial", skill["resume_skill"], float(skill["similarity"]))
+                         for skill in skill_analysis["partial_matches"]]
+                rows += [(analysis_id, skill["skill"], "missing", None, float(skill["similarity"]))
+                         for skill in skill_analysis["missing_skills"]]
+                conn.executemany(INSERT_ANALYSIS_SKILL, rows)
+            return analysis_id
+        except Exception as e:
+            print(f"Error saving analysis: {e}")
+            return None
+    
+    def get_analysis_history(self, user_id, limit=20, before_id=None):
+        """Newest-first page of a user's analyses; pass the last id seen as before_id for the next page."""
+        try:
+            with self.pool.connection() as conn:
+                rows = conn.execute(
+                    SELECT_HISTORY, (user_id, before_id if before_id is not None else 2**63 - 1, limit)
+                ).fetchall()
+            return [{
+                "id": row[0],
+                "created_at": row[1],
+                "compatibility_score": row[2],
+                "high_match_count": row[3],
+                "partial_match_count": row[4],
+                "missing_count": row[5]
+            } for row in rows]
+        except Exception as e:
+            print(f"Error getting analysis history: {e}")
+            return []
+    
+    def get_most_missing_skills(self, user_id, limit=10):
+        try:
+            with self.pool.connection() as conn:
+                return conn.execute(SELECT_MOST_MISSING, (user_id, limit)).fetchall()
+        except Exception as e:
+            print(f"Error getting missing skills: {e}")
+            return []
+    
+    def get_analysis(self, analysis_id, user_id):
+        """Stored analysis results, exactly as analyze_skill_gap returned them."""
+        try:
+            with self.pool.connection() as conn:
+                row = conn.execute(SELECT_ANALYSIS, (analysis_id, user_id)).fetchone()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            print(f"Error getting analysis: {e}")
+            return None
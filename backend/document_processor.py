@@ -1,37 +1,126 @@
 # backend/document_processor.py
 
+import io
+import os
 import re
-import docx2txt
-import PyPDF2
+from concurrent.futures import ProcessPoolExecutor
+from .instrumentation import instrumented
+
+# everything except word characters, whitespace, sentence punctuation and the
+# symbols that skill keywords rely on ("c++", "c#", "ci/cd", "t-sql")
+_DISALLOWED_CHARS_RE = re.compile(r'[^\w\s.,!?;:+#/\-]+')
+
+
+def _extract_page_range(data: bytes, start: int, stop: int):
+    # runs in a worker process, so it re-opens the PDF from raw bytes
+    import PyPDF2
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [pdf_reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
 
 class DocumentProcessor:
     
+    # budgets so an oversized upload is truncated instead of stalling the worker
+    MAX_PDF_PAGES = 200
+    MAX_PDF_TEXT_BYTES = 2_000_000
+    # page count from which extraction is spread over a process pool
+    PARALLEL_PDF_PAGES = 40
+    PDF_WORKERS = min(4, os.cpu_count() or 1)
+    
     @staticmethod
+    @instrumented("document.extract_text_from_pdf")
     def extract_text_from_pdf(file) -> str:
+        return "".join(DocumentProcessor.iter_pdf_pages(file))
+    
+    @staticmethod
+    @instrumented("document.iter_pdf_pages")
+    def iter_pdf_pages(file, max_pages=None, max_bytes=None, workers=None):
+        """Yield the text of each PDF page, stopping once the page/byte budget is spent."""
+        max_pages = DocumentProcessor.MAX_PDF_PAGES if max_pages is None else max_pages
+        max_bytes = DocumentProcessor.MAX_PDF_TEXT_BYTES if max_bytes is None else max_bytes
+        workers = DocumentProcessor.PDF_WORKERS if workers is None else workers
+        
+        import PyPDF2  # deferred so pages that never see a PDF don't load it
+        
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "rb") as f:
+                file = io.BytesIO(f.read())
+        
         pdf_reader = PyPDF2.PdfReader(file)
-        return "".join(page.extract_text() or "" for page in pdf_reader.pages)
+        page_count = min(len(pdf_reader.pages), max_pages)
+        
+        if workers > 1 and page_count >= DocumentProcessor.PARALLEL_PDF_PAGES:
+            pages = DocumentProcessor._iter_pdf_pages_parallel(file, page_count, workers)
+        else:
+            pages = (pdf_reader.pages[i].extract_text() or "" for i in range(page_count))
+        
+        used_bytes = 0
+        for text in pages:
+            size = len(text.encode("utf-8"))
+            if used_bytes + size > max_bytes:
+                remaining = max_bytes - used_bytes
+                yield text.encode("utf-8")[:remaining].decode("utf-8", errors="ignore")
+                pages.close()
+                return
+            used_bytes += size
+            yield text
+    
+    @staticmethod
+    def _iter_pdf_pages_parallel(file, page_count, workers):
+        file.seek(0)
+        data = file.read()
+        step = -(-page_count // (workers * 4))
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [
+                pool.submit(_extract_page_range, data, start, min(start + step, page_count))
+                for start in range(0, page_count, step)
+            ]
+            # page order is kept by draining the ranges in submission order
+            for future in futures:
+                yield from future.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
         
     @staticmethod
+    @instrumented("document.extract_text_from_docx")
     def extract_text_from_docx(file) -> str:
+        import docx2txt
         return docx2txt.process(file)
         
     @staticmethod
+    @instrumented("document.extract_text_from_txt")
     def extract_text_from_txt(file) -> str:
         return file.read().decode("utf-8")
     
     @staticmethod
-    def preprocess_text(text: str) -> str:
+    @instrumented("document.preprocess_text", size_arg=0)
+    def preprocess_text(text) -> str:
+        # accepts a string or an iterable of chunks (e.g. iter_pdf_pages)
         if not text:
             return ""
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'[^\w\s.,!?;:]', '', text)
-        return text.strip()
+        if isinstance(text, str):
+            return " ".join(_DISALLOWED_CHARS_RE.sub("", text).split())
+        
+        words = []
+        tail = ""
+        for chunk in text:
+            if not chunk:
+                continue
+            chunk = tail + _DISALLOWED_CHARS_RE.sub("", chunk)
+            chunk_words = chunk.split()
+            # a word cut at the chunk boundary continues in the next chunk
+            tail = chunk_words.pop() if chunk_words and not chunk[-1].isspace() else ""
+            words.extend(chunk_words)
+        if tail:
+            words.append(tail)
+        return " ".join(words)
     
     def process_uploaded_file(self, uploaded_file):
         file_type = uploaded_file.type
         
         extractors = {
-            "application/pdf": self.extract_text_from_pdf,
+            "application/pdf": self.iter_pdf_pages,
             "application/vnd.openxmlformats-officedocument.wordprocessingml.document": self.extract_text_from_docx,
             "text/plain": self.extract_text_from_txt
         }
@@ -52,3 +141,33 @@ class DocumentProcessor:
             }
         except Exception as e:
             return False
+    
+    def process_file(self, path):
+        # same result shape as process_uploaded_file, for files on disk
+        extractors = {
+            ".pdf": self.iter_pdf_pages,
+            ".docx": self.extract_text_from_docx,
+            ".txt": self.extract_text_from_txt
+        }
+        extension = os.path.splitext(path)[1].lower()
+        
+        if extension not in extractors:
+            return {"success": False, "error": "File type not correct"}
+        
+        try:
+            if extension == ".txt":
+                with open(path, "rb") as f:
+                    text = self.extract_text_from_txt(f)
+            else:
+                text = extractors[extension](path)
+            processed_text = self.preprocess_text(text)
+            
+            if not processed_text:
+                return {"success": False, "error": "No text could be extracted"}
+            
+            return {
+                "success": True,
+                "text": processed_text
+            }
+        except Exception as e:
+            return {"success": False, "error": str(e)}
@@ -0,0 +1,200 @@
+# backend/embedding_backends.py
+
+import os
+import numpy as np
+
+from .embedding_cache import DEFAULT_CACHE_DIR, normalize_rows
+from .model_registry import EMBEDDING_MODEL_NAME
+
+SENTENCE_TRANSFORMERS_PREFIX = "sentence-transformers/"
+
+# SKILL_ANALYZER_EMBEDDING_BACKEND picks the implementation; threads and batch
+# size apply to whichever one is loaded
+BACKEND_ENV = "SKILL_ANALYZER_EMBEDDING_BACKEND"
+THREADS_ENV = "SKILL_ANALYZER_EMBEDDING_THREADS"
+BATCH_SIZE_ENV = "SKILL_ANALYZER_EMBEDDING_BATCH_SIZE"
+ONNX_MODEL_DIR_ENV = "SKILL_ANALYZER_ONNX_MODEL_DIR"
+
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_ONNX_MODEL_DIR = os.path.join(DEFAULT_CACHE_DIR, "onnx", EMBEDDING_MODEL_NAME)
+ONNX_MODEL_FILE = "model_int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+# word pieces per input, as in the sentence-transformers model config
+MAX_SEQ_LENGTH = 256
+
+
+class EmbeddingBackend:
+    """Sentence embedding model behind NLPProcessor.get_embeddings.
+
+    encode() follows SentenceTransformer.encode, so a backend can stand in
+    wherever the model itself was used. model_id names the weights and
+    numerics, and keys every embedding cache built from this backend.
+    """
+
+    model_id = None
+
+    def __init__(self, threads=None, batch_size=None):
+        self.threads = threads
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+
+    def encode(self, texts, batch_size=None, convert_to_numpy=True, normalize_embeddings=False, **kwargs):
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+        batch_size = batch_size or self.batch_size
+        if texts:
+            embeddings = np.concatenate([
+                self._encode_batch(texts[start:start + batch_size])
+                for start in range(0, len(texts), batch_size)
+            ])
+        else:
+            embeddings = np.empty((0, self.dimension), dtype=np.float32)
+        if normalize_embeddings:
+            embeddings = normalize_rows(embeddings)
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, texts):
+        raise NotImplementedError
+
+
+class TorchBackend(EmbeddingBackend):
+    """The sentence-transformers model on PyTorch, as the app has always run it."""
+
+    def __init__(self, model_name=EMBEDDING_MODEL_NAME, threads=None, batch_size=None):
+        super().__init__(threads, batch_size)
+        import torch
+        from sentence_transformers import SentenceTransformer
+        if threads:
+            torch.set_num_threads(threads)
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.model_id = model_name
+        self.dimension = self.model.get_sentence_embedding_dimension()
+
+    def _encode_batch(self, texts):
+        return self.model.encode(texts, batch_size=len(texts), convert_to_numpy=True)
+
+
+class OnnxBackend(EmbeddingBackend):
+    """An int8-quantized ONNX export of the same model on ONNX Runtime.
+
+    Reproduces the sentence-transformers pipeline for MiniLM (mean pooling
+    over the attention mask, then L2 normalization) without importing torch.
+    Build the model directory once with export_onnx_model.
+    """
+
+    def __init__(self, model_dir=DEFAULT_ONNX_MODEL_DIR, threads=None, batch_size=None):
+        super().__init__(threads, batch_size)
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        model_path = os.path.join(model_dir, ONNX_MODEL_FILE)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"No ONNX model at {model_path}; export one with "
+                f"python -m backend.embedding_backends --output {model_dir}"
+            )
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.dimension = self.session.get_outputs()[0].shape[-1]
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()
+        self.model_id = onnx_model_id(model_dir)
+
+    def _encode_batch(self, texts):
+        encodings = self.tokenizer.encode_batch(texts)
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        token_embeddings = self.session.run(None, {k: v for k, v in inputs.items() if k in self.input_names})[0]
+
+        mask = inputs["attention_mask"][:, :, None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return normalize_rows(pooled)
+
+
+def onnx_model_id(model_dir):
+    return f"{os.path.basename(os.path.normpath(model_dir))}-onnx-int8"
+
+
+BACKENDS = {
+    "torch": TorchBackend,
+    "onnx": OnnxBackend,
+}
+
+
+def _int_env(name):
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+def _backend_name(name=None):
+    name = (name or os.environ.get(BACKEND_ENV) or "torch").lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{name}' (expected one of {', '.join(BACKENDS)})")
+    return name
+
+
+def configured_model_id(name=None):
+    """model_id of the backend load_embedding_backend would build, without loading it."""
+    if _backend_name(name) == "onnx":
+        return onnx_model_id(os.environ.get(ONNX_MODEL_DIR_ENV, DEFAULT_ONNX_MODEL_DIR))
+    return EMBEDDING_MODEL_NAME
+
+
+def load_embedding_backend(name=None, threads=None, batch_size=None):
+    """Build the configured backend; arguments override the environment."""
+    name = _backend_name(name)
+    options = {
+        "threads": threads or _int_env(THREADS_ENV),
+        "batch_size": batch_size or _int_env(BATCH_SIZE_ENV),
+    }
+    if name == "onnx":
+        options["model_dir"] = os.environ.get(ONNX_MODEL_DIR_ENV, DEFAULT_ONNX_MODEL_DIR)
+    return BACKENDS[name](**options)
+
+
+def export_onnx_model(model_name=EMBEDDING_MODEL_NAME, output_dir=DEFAULT_ONNX_MODEL_DIR):
+    """Export the transformer to ONNX and quantize its weights to int8."""
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel, AutoTokenizer
+
+    repo = model_name if "/" in model_name else SENTENCE_TRANSFORMERS_PREFIX + model_name
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(repo)
+    model = AutoModel.from_pretrained(repo).eval()
+    tokenizer.backend_tokenizer.save(os.path.join(output_dir, TOKENIZER_FILE))
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    names = ["input_ids", "attention_mask", "token_type_ids"]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in names}
+    dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+    float_path = os.path.join(output_dir, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            model, tuple(sample[name] for name in names), float_path,
+            input_names=names, output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes, opset_version=14
+        )
+    quantize_dynamic(float_path, os.path.join(output_dir, ONNX_MODEL_FILE), weight_type=QuantType.QInt8)
+    os.remove(float_path)
+    return output_dir
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export the embedding model for the ONNX backend")
+    parser.add_argument("--model", default=EMBEDDING_MODEL_NAME)
+    parser.add_argument("--output", default=DEFAULT_ONNX_MODEL_DIR)
+    args = parser.parse_args()
+    print(f"✅ Exported {args.model} to {export_onnx_model(args.model, args.output)}")
@@ -0,0 +1,76 @@
+# backend/embedding_cache.py
+
+import hashlib
+import os
+import re
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.environ.get("SKILL_ANALYZER_CACHE_DIR", ".skill_analyzer_cache")
+
+
+def vocabulary_hash(vocabulary) -> str:
+    joined = "\n".join(sorted(set(vocabulary)))
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()
+
+
+def normalize_rows(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class VocabularyEmbeddings:
+    """Normalized float32 embeddings for a fixed skill vocabulary.
+
+    The matrix is computed once per (model, vocabulary) pair and saved as an
+    .npy file that later processes memory-map instead of re-encoding.
+    """
+
+    def __init__(self, vocabulary, encode, model_name, cache_dir=DEFAULT_CACHE_DIR):
+        self.vocabulary = sorted(set(vocabulary))
+        self.index = {skill: i for i, skill in enumerate(self.vocabulary)}
+        self.encode = encode
+        self.model_name = model_name
+        self.vocab_hash = vocabulary_hash(self.vocabulary)
+        safe_model = re.sub(r'[^A-Za-z0-9_.-]', '_', model_name)
+        self.path = os.path.join(cache_dir, f"{safe_model}-{self.vocab_hash[:16]}.npy")
+        self.matrix = self._load_or_build()
+
+    def _load_or_build(self):
+        if os.path.exists(self.path):
+            try:
+                matrix = np.load(self.path, mmap_mode="r")
+                if matrix.ndim == 2 and matrix.shape[0] == len(self.vocabulary):
+                    return matrix
+            except (OSError, ValueError):
+                pass
+
+        matrix = normalize_rows(self.encode(self.vocabulary))
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, matrix)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not persist vocabulary embeddings: {e}")
+        return matrix
+
+    def lookup(self, skills):
+        """Return one normalized row per skill; only unknown skills are encoded."""
+        rows = np.empty((len(skills), self.matrix.shape[1]), dtype=np.float32)
+        known_pos, known_idx, unknown = [], [], []
+        for i, skill in enumerate(skills):
+            idx = self.index.get(skill)
+            if idx is None:
+                unknown.append(i)
+            else:
+                known_pos.append(i)
+                known_idx.append(idx)
+
+        if known_pos:
+            rows[known_pos] = self.matrix[known_idx]
+        if unknown:
+            rows[unknown] = normalize_rows(self.encode([skills[i] for i in unknown]))
+        return rows
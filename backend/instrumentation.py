@@ -0,0 +1,156 @@
+# backend/instrumentation.py
+
+import functools
+import inspect
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class MetricsRegistry:
+    """In-process store of stage timings, input sizes and event counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = {}
+
+    def observe(self, stage, seconds, size=None):
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = {"count": 0, "seconds": 0.0, "max_seconds": 0.0, "input_size": 0}
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+            if size is not None:
+                entry["input_size"] += size
+
+    def increment(self, event, value=1):
+        with self._lock:
+            self._counters[event] = self._counters.get(event, 0) + value
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "stages": {name: dict(entry) for name, entry in self._stages.items()},
+                "counters": dict(self._counters),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def to_prometheus(self, prefix="skill_analyzer"):
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time spent in each pipeline stage.",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for name, entry in sorted(snapshot["stages"].items()):
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {entry["count"]}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {entry["seconds"]:.6f}')
+        lines += [
+            f"# HELP {prefix}_stage_max_seconds Slowest single call of each stage.",
+            f"# TYPE {prefix}_stage_max_seconds gauge",
+        ]
+        for name, entry in sorted(snapshot["stages"].items()):
+            lines.append(f'{prefix}_stage_max_seconds{{stage="{name}"}} {entry["max_seconds"]:.6f}')
+        lines += [
+            f"# HELP {prefix}_stage_input_size_total Input size (chars, items or pages) seen by each stage.",
+            f"# TYPE {prefix}_stage_input_size_total counter",
+        ]
+        for name, entry in sorted(snapshot["stages"].items()):
+            lines.append(f'{prefix}_stage_input_size_total{{stage="{name}"}} {entry["input_size"]}')
+        lines += [
+            f"# HELP {prefix}_events_total Pipeline event counters.",
+            f"# TYPE {prefix}_events_total counter",
+        ]
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f'{prefix}_events_total{{event="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+# a single flag check is all an instrumented call costs while this is off
+_enabled = os.environ.get("SKILL_ANALYZER_METRICS", "").lower() in ("1", "true", "yes")
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def count(event, value=1):
+    if _enabled:
+        metrics.increment(event, value)
+
+
+def _size_of(value):
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+@contextmanager
+def span(stage, size=None):
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe(stage, time.perf_counter() - start, size)
+
+
+def instrumented(stage, size_arg=None):
+    """Record each call's duration under stage; size_arg is the positional
+    argument whose len() is recorded as the input size. Generator functions
+    are timed over their whole iteration and report the number of items."""
+
+    def decorator(fn):
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def generator_wrapper(*args, **kwargs):
+                if not _enabled:
+                    yield from fn(*args, **kwargs)
+                    return
+                start = time.perf_counter()
+                items = 0
+                try:
+                    for item in fn(*args, **kwargs):
+                        items += 1
+                        yield item
+                finally:
+                    metrics.observe(stage, time.perf_counter() - start, items)
+            return generator_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                size = None
+                if size_arg is not None and size_arg < len(args):
+                    size = _size_of(args[size_arg])
+                metrics.observe(stage, time.perf_counter() - start, size)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,143 @@
+# backend/job_queue.py
+
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFullError(Exception):
+    """Raised when too many jobs are already queued or running."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when its progress callback sees a cancel request."""
+
+
+class Job:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, job_id, key):
+        self.id = job_id
+        self.key = key
+        self.status = Job.QUEUED
+        self.progress = 0.0
+        self.message = "Queued"
+        self.result = None
+        self.error = None
+        self.future = None
+        # sessions waiting on this job; it is only cancelled once all of them cancel
+        self.subscribers = 1
+        self._cancel_requested = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in (Job.DONE, Job.FAILED, Job.CANCELLED)
+
+    def report(self, progress, message=None):
+        # passed to the job function as its progress callback
+        if self._cancel_requested.is_set():
+            raise JobCancelled()
+        self.progress = progress
+        if message is not None:
+            self.message = message
+
+
+class JobQueue:
+    """Bounded background executor for analyses, polled from Streamlit reruns.
+
+    Identical in-flight jobs (same key) are shared, and submissions beyond
+    max_pending are refused with QueueFullError instead of piling up. Each
+    submit of a shared job must be matched by at most one cancel.
+    """
+
+    def __init__(self, max_workers=2, max_pending=8, max_finished=256):
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs = OrderedDict()
+        self._in_flight = {}
+
+    def submit(self, fn, *args, key=None, **kwargs):
+        """Run fn(*args, progress=job.report, **kwargs) in the background."""
+        with self._lock:
+            if key is not None and key in self._in_flight:
+                job = self._in_flight[key]
+                job.subscribers += 1
+                return job
+            pending = sum(1 for job in self._jobs.values() if not job.finished)
+            if pending >= self.max_pending:
+                raise QueueFullError(f"{pending} analyses already pending")
+
+            job = Job(next(self._ids), key)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._in_flight[key] = job
+            self._prune()
+            job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+            return job
+
+    def _run(self, job, fn, args, kwargs):
+        try:
+            job.report(0.0, "Starting")
+            job.status = Job.RUNNING
+            job.result = fn(*args, progress=job.report, **kwargs)
+            job.progress = 1.0
+            job.message = "Done"
+            job.status = Job.DONE
+        except JobCancelled:
+            job.status = Job.CANCELLED
+            job.message = "Cancelled"
+        except Exception as e:
+            job.error = e
+            job.message = f"Failed: {e}"
+            job.status = Job.FAILED
+        finally:
+            with self._lock:
+                if job.key is not None and self._in_flight.get(job.key) is job:
+                    del self._in_flight[job.key]
+
+    def _prune(self):
+        # keep finished jobs around for polling, but only the most recent ones
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Drop one subscriber's interest in a job; the job stops when the last one cancels."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+            job.subscribers -= 1
+            if job.subscribers > 0:
+                return True
+            job._cancel_requested.set()
+            # a new submit with the same key starts afresh instead of joining a cancelled job
+            if job.key is not None and self._in_flight.get(job.key) is job:
+                del self._in_flight[job.key]
+            if job.future.cancel():
+                # never started, so _run won't mark it
+                job.status = Job.CANCELLED
+                job.message = "Cancelled"
+        return True
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return counts
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,125 @@
+# backend/model_registry.py
+
+import threading
+
+SPACY_MODEL_NAME = "en_core_web_sm"
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+def _load_spacy():
+    import spacy
+    return spacy.load(SPACY_MODEL_NAME)
+
+
+def _load_embedding_model():
+    # torch or ONNX Runtime, per SKILL_ANALYZER_EMBEDDING_BACKEND
+    from .embedding_backends import load_embedding_backend
+    return load_embedding_backend()
+
+
+def _load_sentiment_analyzer():
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
+
+class ModelRegistry:
+    """Process-wide store of loaded models shared by every session.
+
+    Models are loaded lazily on first acquire and reference counted, so any
+    number of NLPProcessor instances hold a single copy of each pipeline.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaders = {}
+        self._models = {}
+        self._refcounts = {}
+        # one lock per model so a slow load doesn't block unrelated lookups
+        self._load_locks = {}
+
+    def register(self, name, loader):
+        with self._lock:
+            self._loaders[name] = loader
+            self._load_locks.setdefault(name, threading.Lock())
+
+    def acquire(self, name, loader=None):
+        model = self.get(name, loader)
+        with self._lock:
+            self._refcounts[name] = self._refcounts.get(name, 0) + 1
+        return model
+
+    def get(self, name, loader=None):
+        # like acquire, but without taking a reference (for process-lifetime objects)
+        if loader is not None and name not in self._loaders:
+            self.register(name, loader)
+        with self._lock:
+            if name not in self._loaders:
+                raise KeyError(f"No loader registered for model '{name}'")
+            load_lock = self._load_locks[name]
+
+        with load_lock:
+            with self._lock:
+                model = self._models.get(name)
+            if model is None:
+                model = self._loaders[name]()
+                with self._lock:
+                    self._models[name] = model
+        return model
+
+    def release(self, name):
+        with self._lock:
+            if self._refcounts.get(name, 0) > 0:
+                self._refcounts[name] -= 1
+
+    def refcount(self, name):
+        with self._lock:
+            return self._refcounts.get(name, 0)
+
+    def is_loaded(self, name):
+        with self._lock:
+            return name in self._models
+
+    def preload(self, *names):
+        # load without taking a reference, e.g. at process start
+        for name in names:
+            self.get(name)
+
+    def evict_unused(self):
+        # models stay warm after the last release; call this to free them
+        with self._lock:
+            # objects only ever fetched with get() have no refcount and are kept
+            unused = [name for name in self._models if self._refcounts.get(name) == 0]
+            for name in unused:
+                del self._models[name]
+        return unused
+
+
+_warmup_thread = None
+_warmup_lock = threading.Lock()
+
+
+def _warm_up():
+    try:
+        from .nlp_processor import NLPProcessor
+        processor = NLPProcessor()
+        processor.vocabulary_embeddings  # also loads or builds the vocabulary matrix
+        processor.close()
+        print("✅ NLP models preloaded")
+    except Exception as e:
+        print(f"❌ Error preloading NLP models: {e}")
+
+
+def start_background_warmup():
+    """Load the analysis models on a daemon thread, once per process."""
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_warm_up, name="model-warmup", daemon=True)
+            _warmup_thread.start()
+        return _warmup_thread
+
+
+registry = ModelRegistry()
+registry.register("spacy", _load_spacy)
+registry.register("embedding", _load_embedding_model)
+registry.register("sentiment", _load_sentiment_analyzer)
@@ -1,122 +1,233 @@
 # backend/nlp_processor.py
 
-import spacy
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from sentence_transformers import SentenceTransformer
+import hashlib
 import re
+import threading
+from collections import OrderedDict
+import numpy as np
+from .instrumentation import count, instrumented
+from .embedding_cache import VocabularyEmbeddings, normalize_rows
+from .model_registry import registry, EMBEDDING_MODEL_NAME
+from .skill_taxonomy import load_taxonomy
+
+# sentence boundaries for chunked sentiment scoring
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+# sentence or line boundaries; no skill keyword spans one, so per-segment
+# skills union to the whole-document result
+_SEGMENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+|\s*\n\s*')
 
 class NLPProcessor:
     
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
-        self.sentiment_analyzer = SentimentIntensityAnalyzer()
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+    # models are shared process-wide through the registry; VADER is
+    # only acquired once something actually asks for sentiment
+    MODEL_NAMES = ("spacy", "embedding")
+    
+    # sentiment scores per document hash, shared by every instance
+    SENTIMENT_CACHE_SIZE = 512
+    _sentiment_cache = OrderedDict()
+    _sentiment_lock = threading.Lock()
+    
+    # skills per (vocabulary, sentence), shared by every instance, so an edited
+    # document only re-scans the sentences that changed
+    SEGMENT_CACHE_SIZE = 8192
+    _segment_cache = OrderedDict()
+    _segment_lock = threading.Lock()
+    
+    # the skill pass only reads token.text, so it needs no pipeline components
+    SKILL_PIPE_COMPONENTS = ()
+    
+    # MiniLM truncates at 256 word pieces, so documents are embedded in word windows
+    DOCUMENT_CHUNK_WORDS = 150
+    
+    def __init__(self, model_registry=None):
+        self.registry = model_registry or registry
+        self.nlp = self.registry.acquire("spacy")
+        self._sentiment_analyzer = None
+        self.embedding_model = self.registry.acquire("embedding")
+        # backends name their weights and numerics, so caches never mix int8 and fp32 vectors
+        self.embedding_model_name = getattr(self.embedding_model, "model_id", None) or EMBEDDING_MODEL_NAME
+        self._held_models = list(self.MODEL_NAMES)
+        self._vocab_embeddings = None
+        self._closed = False
         
-        # Skill keywords
-        self.skill_keywords = {
-    # Programming Languages
-    "python", "python3", "django", "flask", "numpy", "pandas", "tensorflow", "pytorch",
-    "java", "spring", "spring boot", "hibernate", "j2ee", "jsp", "servlet",
-    "javascript", "typescript", "es6", "react", "angular", "vue", "vue.js", "node.js", 
-    "express.js", "next.js", "redux", "jquery", "ajax",
-    "c++", "c#", ".net", "asp.net", "core", "mvc",
-    "php", "laravel", "symfony", "codeigniter", "wordpress",
-    "ruby", "rails", "ruby on rails", "sinatra",
-    "go", "golang", "rust", "swift", "kotlin", "dart", "flutter",
-    
-    # Databases
-    "sql", "mysql", "postgresql", "postgres", "oracle", "sql server", "mongodb",
-    "nosql", "redis", "cassandra", "dynamodb", "elasticsearch", "firebase",
-    "pl/sql", "t-sql", "database design", "data modeling",
-    
-    # Cloud & DevOps
-    "aws", "amazon web services", "ec2", "s3", "lambda", "rds", "cloudformation",
-    "azure", "microsoft azure", "google cloud", "gcp", "cloud computing",
-    "docker", "kubernetes", "k8s", "jenkins", "ansible", "terraform", "ci/cd",
-    "git", "github", "gitlab", "bitbucket", "jira", "confluence",
-    
-    # Web Technologies
-    "html", "html5", "css", "css3", "sass", "scss", "less", "bootstrap",
-    "tailwind", "responsive design", "webpack", "babel", "npm", "yarn",
-    
-    # Data Science & AI
-    "machine learning", "ml", "deep learning", "neural networks", "nlp",
-    "natural language processing", "computer vision", "openai", "chatgpt",
-    "data science", "data analysis", "data analytics", "big data", "hadoop",
-    "spark", "tableau", "power bi", "excel", "statistics", "matplotlib",
-    "seaborn", "scikit-learn", "keras", "artificial intelligence", "ai",
-    
-    # Testing
-    "testing", "unit testing", "integration testing", "selenium", "jest",
-    "mocha", "chai", "cypress", "testng", "junit", "pytest",
-    
-    # Methodologies & Practices
-    "agile", "scrum", "kanban", "waterfall", "devops", "lean",
-    "tdd", "test driven development", "bdd", "behavior driven development",
-    "microservices", "rest", "restful", "api", "graphql", "soap",
-    "oauth", "jwt", "authentication", "authorization",
-    
-    # Mobile Development
-    "android", "ios", "react native", "xamarin", "ionic", "mobile development",
-    
-    # Operating Systems
-    "linux", "unix", "windows", "macos", "shell scripting", "bash", "powershell",
-    
-    # Soft Skills
-    "communication", "teamwork", "leadership", "problem solving", "critical thinking",
-    "time management", "project management", "team management", "mentoring",
-    "presentation", "public speaking", "negotiation", "conflict resolution",
-    "adaptability", "creativity", "analytical skills", "attention to detail",
-    
-    # Business & Tools
-    "photoshop", "illustrator", "figma", "sketch", "adobe xd",
-    "word", "excel", "powerpoint", "outlook", "sharepoint",
-    "salesforce", "sap", "oracle ebs", "erp", "crm",
-    
-    # Specialized Domains
-    "blockchain", "ethereum", "solidity", "smart contracts",
-    "iot", "internet of things", "cybersecurity", "ethical hacking",
-    "game development", "unity", "unreal engine", "ar/vr",
-    "embedded systems", "arduino", "raspberry pi",
-    
-    # Finance & Accounting
-    "accounting", "finance", "quickbooks", "xero", "taxation",
-    
-    # Marketing
-    "digital marketing", "seo", "search engine optimization", "sem",
-    "social media marketing", "content marketing", "email marketing",
-    "google analytics", "adwords", "facebook ads",
-    
-    # Languages
-    "english", "spanish", "french", "german", "chinese", "japanese",
-    "hindi", "multilingual"
-}
+        # Skill taxonomy, compiled once per process; aliases extract as their canonical id
+        self.taxonomy = load_taxonomy()
+        self.skill_keywords = self.taxonomy.skills
+        self.skill_matcher = self.taxonomy.matcher
+        self.vocabulary_hash = self.taxonomy.hash
+    
+    @instrumented("nlp.find_skill_spans", size_arg=1)
+    def find_skill_spans(self, text: str):
+        """Return (start, end, skill id) for each skill or alias occurrence in the text."""
+        if not text:
+            return []
+        return self.skill_matcher.find_matches(text.lower())
     
+    @instrumented("nlp.extract_skills", size_arg=1)
     def extract_skills(self, text: str):
         if not text:
             return []
         
         text_lower = text.lower()
-        found_skills = set()
+        return self._collect_skills(text_lower, self._skill_doc(text_lower))
+    
+    @instrumented("nlp.extract_skills_batch", size_arg=1)
+    def extract_skills_batch(self, texts, batch_size=64, n_process=1):
+        """extract_skills over many documents, streamed through spaCy in batches."""
+        texts_lower = [text.lower() if text else "" for text in texts]
+        docs = self._skill_docs(texts_lower, batch_size=batch_size, n_process=n_process)
+        return [
+            self._collect_skills(text_lower, doc) if text_lower else []
+            for text_lower, doc in zip(texts_lower, docs)
+        ]
+    
+    @instrumented("nlp.extract_skills_segmented", size_arg=1)
+    def extract_skills_segmented(self, text: str):
+        """extract_skills with results cached per sentence; returns the skills sorted."""
+        segments = list(dict.fromkeys(s for s in _SEGMENT_SPLIT_RE.split(text or "") if s.strip()))
+        found, missing = set(), []
+        with self._segment_lock:
+            for segment in segments:
+                skills = self._segment_cache.get((self.vocabulary_hash, segment))
+                if skills is None:
+                    missing.append(segment)
+                else:
+                    self._segment_cache.move_to_end((self.vocabulary_hash, segment))
+                    found.update(skills)
+        count("segment_cache_hit", len(segments) - len(missing))
+        count("segment_cache_miss", len(missing))
         
-        # Direct keyword matching
-        for skill in self.skill_keywords:
-            if skill in text_lower:
-                found_skills.add(skill)
+        if missing:
+            extracted = self.extract_skills_batch(missing)
+            with self._segment_lock:
+                for segment, skills in zip(missing, extracted):
+                    self._segment_cache[(self.vocabulary_hash, segment)] = frozenset(skills)
+                    found.update(skills)
+                while len(self._segment_cache) > self.SEGMENT_CACHE_SIZE:
+                    self._segment_cache.popitem(last=False)
+        return sorted(found)
+    
+    def _skill_pipe_disabled(self):
+        return [name for name in self.nlp.pipe_names if name not in self.SKILL_PIPE_COMPONENTS]
+    
+    def _skill_doc(self, text_lower):
+        if not self.SKILL_PIPE_COMPONENTS:
+            return self.nlp.tokenizer(text_lower)
+        return self.nlp(text_lower, disable=self._skill_pipe_disabled())
+    
+    def _skill_docs(self, texts_lower, batch_size, n_process):
+        if not self.SKILL_PIPE_COMPONENTS and n_process == 1:
+            # tokenizer-only path, no tagger/parser/ner/lemmatizer work at all
+            return self.nlp.tokenizer.pipe(texts_lower, batch_size=batch_size)
+        # nlp.pipe is needed for multiprocessing; unused components stay off
+        return self.nlp.pipe(
+            texts_lower,
+            batch_size=batch_size,
+            n_process=n_process,
+            disable=self._skill_pipe_disabled()
+        )
+    
+    def _collect_skills(self, text_lower, doc):
+        # Direct keyword matching on token boundaries
+        found_skills = self.skill_matcher.find_keywords(text_lower)
         
         # Look for skills in context
-        doc = self.nlp(text_lower)
+        surface_forms = self.taxonomy.surface_forms
         for token in doc:
-            if token.text in self.skill_keywords:
-                found_skills.add(token.text)
+            skill = surface_forms.get(token.text)
+            if skill is not None:
+                found_skills.add(skill)
         
         return list(found_skills)
     
+    @property
+    def sentiment_analyzer(self):
+        if self._sentiment_analyzer is None:
+            self._sentiment_analyzer = self.registry.acquire("sentiment")
+            self._held_models.append("sentiment")
+        return self._sentiment_analyzer
+    
+    @instrumented("nlp.analyze_sentiment", size_arg=1)
     def analyze_sentiment(self, text: str):
-        return self.sentiment_analyzer.polarity_scores(text)
+        """VADER scores averaged over sentences, weighted by sentence length."""
+        key = hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+        with self._sentiment_lock:
+            scores = self._sentiment_cache.get(key)
+            if scores is not None:
+                self._sentiment_cache.move_to_end(key)
+                return dict(scores)
+        
+        # VADER is tuned for sentence-length input, not whole documents
+        sentences = [s for s in _SENTENCE_SPLIT_RE.split(text or "") if s.strip()]
+        if len(sentences) <= 1:
+            scores = self.sentiment_analyzer.polarity_scores(text or "")
+        else:
+            totals = {"neg": 0.0, "neu": 0.0, "pos": 0.0, "compound": 0.0}
+            weight = 0
+            for sentence in sentences:
+                sentence_scores = self.sentiment_analyzer.polarity_scores(sentence)
+                for name in totals:
+                    totals[name] += sentence_scores[name] * len(sentence)
+                weight += len(sentence)
+            scores = {name: round(total / weight, 4) for name, total in totals.items()}
+        
+        with self._sentiment_lock:
+            self._sentiment_cache[key] = scores
+            while len(self._sentiment_cache) > self.SENTIMENT_CACHE_SIZE:
+                self._sentiment_cache.popitem(last=False)
+        return dict(scores)
     
+    @instrumented("nlp.get_embeddings", size_arg=1)
     def get_embeddings(self, texts):
         if not texts:
             return None
         return self.embedding_model.encode(texts, convert_to_numpy=True)
-
+    
+    @instrumented("nlp.get_document_embeddings", size_arg=1)
+    def get_document_embeddings(self, texts, batch_size=64):
+        """One normalized float32 row per document: the mean of its chunk embeddings."""
+        chunks, owners = [], []
+        for i, text in enumerate(texts):
+            words = (text or "").split() or [""]
+            for start in range(0, len(words), self.DOCUMENT_CHUNK_WORDS):
+                chunks.append(" ".join(words[start:start + self.DOCUMENT_CHUNK_WORDS]))
+                owners.append(i)
+        if not chunks:
+            return None
+        
+        # every chunk of every document goes through the model in one batched call
+        vectors = normalize_rows(self.embedding_model.encode(chunks, batch_size=batch_size, convert_to_numpy=True))
+        starts = np.searchsorted(owners, np.arange(len(texts)))
+        return normalize_rows(np.add.reduceat(vectors, starts, axis=0))
+    
+    @property
+    def vocabulary_embeddings(self):
+        # embedded once per process (and cached on disk), shared like the models
+        if self._vocab_embeddings is None:
+            key = f"vocab_embeddings:{self.embedding_model_name}:{self.vocabulary_hash}"
+            model, model_name, vocabulary = self.embedding_model, self.embedding_model_name, self.skill_keywords
+            self._vocab_embeddings = self.registry.acquire(
+                key,
+                lambda: VocabularyEmbeddings(
+                    vocabulary,
+                    lambda texts: model.encode(texts, convert_to_numpy=True),
+                    model_name
+                )
+            )
+            self._held_models.append(key)
+        return self._vocab_embeddings
+    
+    @instrumented("nlp.get_skill_embeddings", size_arg=1)
+    def get_skill_embeddings(self, skills):
+        """Normalized float32 embeddings; vocabulary skills skip the transformer."""
+        if not skills:
+            return None
+        return self.vocabulary_embeddings.lookup(list(skills))
+    
+    def close(self):
+        # drop this instance's references; the models stay loaded for others
+        if self._closed:
+            return
+        for name in self._held_models:
+            self.registry.release(name)
+        self._closed = True
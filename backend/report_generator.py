@@ -1,21 +1,67 @@
 # backend/report_generator.py
 
+import copy
 import io
+import os
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
-from reportlab.lib.styles import getSampleStyleSheet
 from .calculations import Calculations
+from .instrumentation import instrumented
+
+# reportlab is only imported once a report is actually requested; the style
+# sheet and the parsed flowables every report contains are then built once
+# per process and shared read-only
+_styles = None
+_flowables = None
+_static_lock = threading.Lock()
+
+
+def get_styles():
+    global _styles
+    with _static_lock:
+        if _styles is None:
+            from reportlab.lib.styles import getSampleStyleSheet
+            _styles = getSampleStyleSheet()
+        return _styles
+
+
+def _static_flowables():
+    global _flowables
+    styles = get_styles()
+    with _static_lock:
+        if _flowables is None:
+            from reportlab.platypus import Paragraph
+            _flowables = {
+                "title": Paragraph("Skill Gap Analysis Report", styles['Title']),
+                "overall": Paragraph("Overall Assessment", styles['Heading2']),
+                "breakdown": Paragraph("Skill Breakdown", styles['Heading2']),
+                "strong": Paragraph("Your Strong Skills:", styles['Heading3']),
+                "improve": Paragraph("Skills to Improve:", styles['Heading3']),
+                "learn": Paragraph("Skills to Learn:", styles['Heading3']),
+                "footer": Paragraph("Generated by Skill Gap Analyzer", styles['Italic']),
+            }
+    # layout marks a flowable as used, so each report lays out shallow copies
+    # and the parsed originals are never touched
+    return {name: copy.copy(flowable) for name, flowable in _flowables.items()}
+
 
 class ReportGenerator:
     
     def __init__(self):
-        self.styles = getSampleStyleSheet()
         self.calculations = Calculations()
     
-    def generate_pdf_report(self, analysis_results):
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
+    @property
+    def styles(self):
+        return get_styles()
+    
+    def build_story(self, analysis_results):
+        """The flowables of one candidate's report."""
+        from reportlab.platypus import Paragraph, Spacer, Table
+        
+        static = _static_flowables()
         story = []
         
         skill_analysis = analysis_results["skill_analysis"]
@@ -24,13 +70,13 @@ class ReportGenerator:
         skill_coverage = self.calculations.calculate_skill_coverage(skill_analysis)
         
         # Title and header
-        story.append(Paragraph("Skill Gap Analysis Report", self.styles['Title']))
+        story.append(static["title"])
         story.append(Spacer(1, 10))
         story.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M')}", self.styles['Normal']))
         story.append(Spacer(1, 20))
         
         # Overall metrics
-        story.append(Paragraph("Overall Assessment", self.styles['Heading2']))
+        story.append(static["overall"])
         metrics_data = [
             ['Overall Compatibility', f"{compatibility_score:.1f}%"],
             ['Skill Gap', f"{skill_gap:.1f}%"],
@@ -47,7 +93,7 @@ class ReportGenerator:
         story.append(Spacer(1, 20))
         
         # Skill breakdown
-        story.append(Paragraph("Skill Breakdown", self.styles['Heading2']))
+        story.append(static["breakdown"])
         breakdown_data = [
             ['High Matches', str(skill_analysis['high_match_count'])],
             ['Partial Matches', str(skill_analysis['partial_match_count'])],
@@ -60,25 +106,99 @@ class ReportGenerator:
         
         # Skills lists
         if skill_analysis['matched_skills']:
-            story.append(Paragraph("Your Strong Skills:", self.styles['Heading3']))
+            story.append(static["strong"])
             for skill in skill_analysis['matched_skills'][:10]:
                 story.append(Paragraph(f"• {skill['job_skill']}", self.styles['Normal']))
             story.append(Spacer(1, 10))
         
         if skill_analysis['partial_matches']:
-            story.append(Paragraph("Skills to Improve:", self.styles['Heading3']))
+            story.append(static["improve"])
             for skill in skill_analysis['partial_matches'][:10]:
                 story.append(Paragraph(f"• {skill['job_skill']}", self.styles['Normal']))
             story.append(Spacer(1, 10))
         
         if skill_analysis['missing_skills']:
-            story.append(Paragraph("Skills to Learn:", self.styles['Heading3']))
+            story.append(static["learn"])
             for skill in skill_analysis['missing_skills'][:10]:
                 story.append(Paragraph(f"• {skill['skill']}", self.styles['Normal']))
         
         story.append(Spacer(1, 20))
-        story.append(Paragraph("Generated by Skill Gap Analyzer", self.styles['Italic']))
+        story.append(static["footer"])
+        return story
+    
+    @instrumented("report.generate_pdf_report")
+    def generate_pdf_report(self, analysis_results, output=None):
+        """Render one report; writes to output (a binary file object) if given, else returns the bytes."""
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import SimpleDocTemplate
         
-        doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
+        target = output if output is not None else io.BytesIO()
+        SimpleDocTemplate(target, pagesize=A4).build(self.build_story(analysis_results))
+        if output is None:
+            return target.getvalue()
+    
+    @instrumented("report.write_combined_pdf", size_arg=1)
+    def write_combined_pdf(self, analyses, output):
+        """Every analysis in one PDF, each starting on a new page, written straight to output."""
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import PageBreak, SimpleDocTemplate
+        
+        story = []
+        for i, analysis_results in enumerate(analyses):
+            if i:
+                story.append(PageBreak())
+            story.extend(self.build_story(analysis_results))
+        SimpleDocTemplate(output, pagesize=A4).build(story)
+
+
+# per-process generator for pool workers
+_worker_generator = None
+
+
+def _render_report(analysis_results):
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = ReportGenerator()
+    return _worker_generator.generate_pdf_report(analysis_results)
+
+
+def iter_pdf_reports(analyses, workers=None):
+    """Yield each analysis's PDF bytes, in order, rendered concurrently in a process pool.
+
+    At most two reports per worker are in flight, so memory stays bounded
+    however many analyses are passed.
+    """
+    workers = workers or os.cpu_count() or 1
+    analyses = iter(analyses)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for analysis_results in analyses:
+            pending.append(pool.submit(_render_report, analysis_results))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def report_name(analysis_results, position):
+    # analyze_batch / shortlist results carry where the resume came from
+    if "resume_id" in analysis_results:
+        return f"report_resume_{analysis_results['resume_id']}.pdf"
+    return f"report_{position + 1:03d}.pdf"
+
+
+@instrumented("report.write_zip", size_arg=0)
+def write_reports_zip(analyses, output, workers=None, names=None):
+    """One PDF per analysis in a ZIP archive written to output as each report finishes.
+
+    output may be any writable binary file object, including an unseekable
+    stream such as a socket or an HTTP response body.
+    """
+    analyses = list(analyses)  # small next to the PDFs, which are never all held at once
+    names = names or [report_name(analysis_results, i) for i, analysis_results in enumerate(analyses)]
+    # PDF streams are already compressed
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, pdf in zip(names, iter_pdf_reports(analyses, workers)):
+            with archive.open(name, "w") as entry:
+                entry.write(pdf)
+    return len(names)
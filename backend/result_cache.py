@@ -0,0 +1,148 @@
+# backend/result_cache.py
+
+import base64
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from .skill_result import SkillAnalysis, json_default
+
+# the SQLite tier keeps skill_analysis as base64 SkillAnalysis.to_bytes() under this key
+_SKILL_ANALYSIS_BYTES = "skill_analysis_bytes"
+
+
+def _dumps(result):
+    payload = dict(result)
+    skill_analysis = payload.get("skill_analysis")
+    if isinstance(skill_analysis, SkillAnalysis):
+        payload["skill_analysis"] = {
+            _SKILL_ANALYSIS_BYTES: base64.b64encode(skill_analysis.to_bytes()).decode("ascii")
+        }
+    return json.dumps(payload, default=json_default)
+
+
+def _loads(text):
+    # disk hits come back in the same shape as memory hits
+    result = json.loads(text)
+    skill_analysis = result.get("skill_analysis")
+    if isinstance(skill_analysis, dict):
+        if _SKILL_ANALYSIS_BYTES in skill_analysis:
+            result["skill_analysis"] = SkillAnalysis.from_bytes(
+                base64.b64decode(skill_analysis[_SKILL_ANALYSIS_BYTES]))
+        else:
+            # rows written before results were stored as bytes
+            result["skill_analysis"] = SkillAnalysis.from_dict(skill_analysis)
+    return result
+
+
+class AnalysisCache:
+    """Content-addressed cache for analyze_skill_gap results.
+
+    An in-memory LRU tier sits in front of an optional SQLite tier; both are
+    bounded and evict the least recently used entries.
+    """
+
+    def __init__(self, max_entries=256, db_path=None, max_db_entries=10000):
+        self.max_entries = max_entries
+        self.max_db_entries = max_db_entries
+        self.db_path = db_path
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._conn = None
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            ''')
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_analysis_cache_last_used ON analysis_cache (last_used)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(resume_text, job_desc_text, model_name, vocabulary_hash, **options):
+        digest = hashlib.sha256()
+        for part in (model_name, vocabulary_hash, json.dumps(options, sort_keys=True),
+                     resume_text or "", job_desc_text or ""):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(result)
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT result FROM analysis_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE analysis_cache SET last_used = ? WHERE key = ?", (time.time(), key)
+                    )
+                    self._conn.commit()
+                    result = _loads(row[0])
+                    self._remember(key, result)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return copy.deepcopy(result)
+
+            self.misses += 1
+            return None
+
+    def put(self, key, result):
+        with self._lock:
+            self._remember(key, copy.deepcopy(result))
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO analysis_cache (key, result, last_used) VALUES (?, ?, ?)",
+                    (key, _dumps(result), time.time())
+                )
+                self._conn.execute('''
+                    DELETE FROM analysis_cache WHERE key NOT IN (
+                        SELECT key FROM analysis_cache ORDER BY last_used DESC LIMIT ?
+                    )
+                ''', (self.max_db_entries,))
+                self._conn.commit()
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM analysis_cache")
+                self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "memory_entries": len(self._memory)
+            }
+
+
+def load_shared_cache():
+    # the SQLite tier is opt-in, e.g. SKILL_ANALYZER_RESULT_CACHE_DB=analysis_cache.db
+    return AnalysisCache(db_path=os.environ.get("SKILL_ANALYZER_RESULT_CACHE_DB"))
@@ -0,0 +1,60 @@
+# backend/resume_indexing.py
+
+from .job_queue import JobQueue, QueueFullError
+from .skill_index import SkillIndex, index_resume_text, rebuild_skill_index
+from .vector_index import VectorIndex, embed_resume_text
+
+# indexing has its own small queue so uploads never take slots from analyses
+INDEX_QUEUE_WORKERS = 1
+INDEX_QUEUE_PENDING = 64
+RECONCILE_BATCH_SIZE = 64
+
+
+def get_indexes(registry, db):
+    """The process-wide skill index, vector index and indexing queue.
+
+    A skill index built with another taxonomy is rebuilt on the indexing
+    queue; it answers from its old postings until then.
+    """
+    skill_index = registry.get("skill_index", lambda: SkillIndex(db))
+    vector_index = registry.get("vector_index", VectorIndex)
+    index_queue = registry.get(
+        "index_queue", lambda: JobQueue(max_workers=INDEX_QUEUE_WORKERS, max_pending=INDEX_QUEUE_PENDING)
+    )
+    if skill_index.needs_rebuild:
+        try:
+            index_queue.submit(rebuild_skill_index, skill_index, key="rebuild_skill_index")
+        except QueueFullError:
+            pass  # retried on the next call
+    return skill_index, vector_index, index_queue
+
+
+def submit_resume(index_queue, skill_index, vector_index, resume_id, text):
+    """Queue whichever indexes don't have the resume yet; False if the queue is full."""
+    try:
+        if resume_id not in skill_index:
+            index_queue.submit(index_resume_text, skill_index, resume_id, text, key=f"index_resume:{resume_id}")
+        if resume_id not in vector_index:
+            index_queue.submit(embed_resume_text, vector_index, resume_id, text, key=f"embed_resume:{resume_id}")
+    except QueueFullError:
+        return False
+    return True
+
+
+def reconcile(db, index_queue, skill_index, vector_index):
+    """Queue every stored resume missing from either index; returns how many were queued.
+
+    Covers resumes whose indexing was dropped on a full queue or a crash, and
+    resumes stored by save_analysis without going through the upload page.
+    Stops early once the queue is full; the next call picks up the rest.
+    """
+    resume_ids = db.get_document_ids("resume")
+    missing = sorted(set(skill_index.missing(resume_ids)) | set(vector_index.missing(resume_ids)))
+    queued = 0
+    for start in range(0, len(missing), RECONCILE_BATCH_SIZE):
+        texts = db.get_documents(missing[start:start + RECONCILE_BATCH_SIZE])
+        for resume_id, text in texts.items():
+            if not submit_resume(index_queue, skill_index, vector_index, resume_id, text):
+                return queued
+            queued += 1
+    return queued
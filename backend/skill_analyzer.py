@@ -1,132 +1,265 @@
 # backend/skill_analyzer.py
 
+import hashlib
+import threading
+from collections import OrderedDict
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+from .instrumentation import count, instrumented
+from .skill_result import SkillAnalysis
+
+def _no_progress(fraction, message=None):
+    pass
 
 class SkillAnalyzer:
     
-    def __init__(self, nlp_processor):
+    # extracted skills and their embeddings per document, shared by every
+    # instance: re-running with one side edited only recomputes that side
+    SIDE_CACHE_SIZE = 64
+    _side_cache = OrderedDict()
+    _side_lock = threading.Lock()
+    
+    def __init__(self, nlp_processor=None, cache=None):
+        if nlp_processor is None:
+            from .nlp_processor import NLPProcessor
+            nlp_processor = NLPProcessor()
+        # the processor's models come from the shared registry
         self.nlp = nlp_processor
+        # optional AnalysisCache keyed on document hashes
+        self.cache = cache
     
-    def analyze_skill_gap(self, resume_text: str, job_desc_text: str):
-        resume_skills = self.nlp.extract_skills(resume_text)
-        job_desc_skills = self.nlp.extract_skills(job_desc_text)
+    def analyze_skill_gap(self, resume_text: str, job_desc_text: str, progress=None,
+                          include_sentiment=False):
+        # progress, if given, is called as progress(fraction, message) between stages;
+        # sentiment is opt-in since nothing in the scoring uses it
+        progress = progress or _no_progress
+        if self.cache is None:
+            return self._analyze_skill_gap(resume_text, job_desc_text, progress, include_sentiment)
         
-        resume_sentiment = self.nlp.analyze_sentiment(resume_text)
-        job_desc_sentiment = self.nlp.analyze_sentiment(job_desc_text)
+        key = self.cache.make_key(
+            resume_text, job_desc_text,
+            self.nlp.embedding_model_name, self.nlp.vocabulary_hash,
+            include_sentiment=include_sentiment
+        )
+        results = self.cache.get(key)
+        if results is None:
+            count("analysis_cache_miss")
+            results = self._analyze_skill_gap(resume_text, job_desc_text, progress, include_sentiment)
+            self.cache.put(key, results)
+        else:
+            count("analysis_cache_hit")
+        return results
+    
+    @instrumented("analyzer.analyze_skill_gap")
+    def _analyze_skill_gap(self, resume_text: str, job_desc_text: str, progress=_no_progress,
+                           include_sentiment=False):
+        progress(0.05, "Extracting resume skills")
+        resume_skills, resume_embeddings = self._document_skills(resume_text)
+        progress(0.3, "Extracting job description skills")
+        job_desc_skills, job_embeddings = self._document_skills(job_desc_text)
         
-        skill_analysis = self._match_skills(resume_skills, job_desc_skills)
+        progress(0.55, "Matching skills")
+        skill_analysis = self._match_embeddings(resume_skills, job_desc_skills, resume_embeddings, job_embeddings)
         compatibility_score = self._calculate_compatibility(skill_analysis)
         
-        return {
+        results = {
             "resume_skills": resume_skills,
             "job_desc_skills": job_desc_skills,
             "skill_analysis": skill_analysis,
             "compatibility_score": compatibility_score
         }
+        if include_sentiment:
+            progress(0.8, "Analyzing sentiment")
+            results["resume_sentiment"] = self.nlp.analyze_sentiment(resume_text)
+            results["job_desc_sentiment"] = self.nlp.analyze_sentiment(job_desc_text)
+        progress(0.95, "Finishing up")
+        return results
+    
+    def _document_skills(self, text):
+        # (skills, normalized embeddings) for one side of an analysis; the cache
+        # keeps the skills as a tuple and callers get their own list
+        key = (
+            self.nlp.embedding_model_name,
+            self.nlp.vocabulary_hash,
+            hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+        )
+        with self._side_lock:
+            side = self._side_cache.get(key)
+            if side is not None:
+                self._side_cache.move_to_end(key)
+        if side is not None:
+            count("side_cache_hit")
+            return list(side[0]), side[1]
+        
+        count("side_cache_miss")
+        skills = self.nlp.extract_skills_segmented(text)
+        embeddings = self.nlp.get_skill_embeddings(skills)
+        if embeddings is not None:
+            embeddings.setflags(write=False)
+        with self._side_lock:
+            self._side_cache[key] = (tuple(skills), embeddings)
+            while len(self._side_cache) > self.SIDE_CACHE_SIZE:
+                self._side_cache.popitem(last=False)
+        return list(skills), embeddings
+    
+    @instrumented("analyzer.analyze_batch", size_arg=1)
+    def analyze_batch(self, resume_texts, job_desc_texts, top_k=None, batch_size=64, n_process=1):
+        """Score many resumes against one or more job descriptions.
+
+        Returns the ranked analyses for a single job description, or one ranked
+        list per job description when a list is passed. Each entry has the
+        analyze_skill_gap shape plus resume_index/job_desc_index.
+        """
+        single_job = isinstance(job_desc_texts, str)
+        if single_job:
+            job_desc_texts = [job_desc_texts]
+        
+        resume_skill_lists = self.nlp.extract_skills_batch(
+            resume_texts, batch_size=batch_size, n_process=n_process
+        )
+        
+        # every distinct resume skill in the batch is embedded once
+        batch_skills = sorted(set().union(*resume_skill_lists))
+        batch_embeddings = self.nlp.get_skill_embeddings(batch_skills)
+        skill_rows = {skill: i for i, skill in enumerate(batch_skills)}
+        resume_rows = [
+            np.array([skill_rows[skill] for skill in skills], dtype=np.intp)
+            for skills in resume_skill_lists
+        ]
+        
+        rankings = []
+        for job_desc_index, job_desc_text in enumerate(job_desc_texts):
+            job_desc_skills, job_embeddings = self._document_skills(job_desc_text)
+            
+            # job x batch-skill block shared by every resume; each resume takes its columns
+            block = None
+            if job_embeddings is not None and batch_embeddings is not None:
+                block = job_embeddings @ batch_embeddings.T
+            
+            results = []
+            for resume_index, resume_skills in enumerate(resume_skill_lists):
+                if block is None:
+                    skill_analysis = self._match_skills(resume_skills, job_desc_skills)
+                else:
+                    skill_analysis = self._tier_matches(
+                        resume_skills, job_desc_skills, block[:, resume_rows[resume_index]]
+                    )
+                results.append({
+                    "resume_index": resume_index,
+                    "job_desc_index": job_desc_index,
+                    "resume_skills": resume_skills,
+                    "job_desc_skills": list(job_desc_skills),
+                    "skill_analysis": skill_analysis,
+                    "compatibility_score": self._calculate_compatibility(skill_analysis)
+                })
+            
+            # stable sort keeps upload order among equal scores
+            results.sort(key=lambda result: result["compatibility_score"], reverse=True)
+            rankings.append(results[:top_k] if top_k is not None else results)
+        
+        return rankings[0] if single_job else rankings
+    
+    @instrumented("analyzer.shortlist_and_analyze")
+    def shortlist_and_analyze(self, job_desc_text, vector_index, load_texts, shortlist_size=100,
+                              top_k=None, n_probe=8):
+        """Rank stored resumes for a job description without skill-matching all of them.
+
+        vector_index (a VectorIndex of resume embeddings) picks the shortlist_size
+        resumes closest to the job description; only those are fetched through
+        load_texts (ids -> {id: text}, e.g. Database.get_documents) and scored by
+        analyze_batch. Entries gain resume_id and semantic_similarity.
+        """
+        vector_index.check_model(self.nlp.embedding_model_name)
+        query = self.nlp.get_document_embeddings([job_desc_text])
+        if query is None:
+            return []
+        hits = vector_index.search(query[0], k=shortlist_size, n_probe=n_probe)
+        texts = load_texts([resume_id for resume_id, _ in hits])
+        hits = [(resume_id, score) for resume_id, score in hits if resume_id in texts]
+        if not hits:
+            return []
+        
+        results = self.analyze_batch([texts[resume_id] for resume_id, _ in hits], job_desc_text, top_k=top_k)
+        for result in results:
+            result["resume_id"], result["semantic_similarity"] = hits[result["resume_index"]]
+        return results
     
     def _match_skills(self, resume_skills, job_desc_skills):
         if not job_desc_skills:
-            return {
-                'matched_skills': [],
-                'partial_matches': [],
-                'missing_skills': [],
-                'overall_match': 0,
-                'high_match_count': 0,
-                'partial_match_count': 0,
-                'missing_count': 0
-            }
+            return SkillAnalysis.empty()
         
+        # Normalized embeddings, so a dot product is the cosine similarity
+        job_embeddings = self.nlp.get_skill_embeddings(job_desc_skills)
+        resume_embeddings = None
+        if job_embeddings is not None:
+            resume_embeddings = self.nlp.get_skill_embeddings(resume_skills)
+        return self._match_embeddings(resume_skills, job_desc_skills, resume_embeddings, job_embeddings)
+    
+    # instrumented here rather than on _match_skills: analyses reach it directly
+    @instrumented("analyzer.match_skills", size_arg=2)
+    def _match_embeddings(self, resume_skills, job_desc_skills, resume_embeddings, job_embeddings):
+        if not job_desc_skills:
+            return SkillAnalysis.empty()
+        
+        if job_embeddings is not None:
+            similarity = None
+            if resume_embeddings is not None:
+                # one rectangular job x resume block
+                similarity = job_embeddings @ resume_embeddings.T
+            return self._tier_matches(resume_skills, job_desc_skills, similarity)
+        
+        # Fallback to string matching
         matched_skills = []
         partial_matches = []
         missing_skills = []
-        
-        # Get embeddings for all skills
-        all_skills = list(set(resume_skills + job_desc_skills))
-        embeddings = self.nlp.get_embeddings(all_skills)
-        
-        if embeddings is not None and len(all_skills) > 0:
-            skill_to_idx = {skill: i for i, skill in enumerate(all_skills)}
-            similarity_matrix = cosine_similarity(embeddings)
-            
-            for job_skill in job_desc_skills:
-                job_idx = skill_to_idx.get(job_skill)
-                if job_idx is None:
-                    continue
-                    
-                best_match = None
-                best_score = 0
-                
-                for resume_skill in resume_skills:
-                    resume_idx = skill_to_idx.get(resume_skill)
-                    if resume_idx is None:
-                        continue
-                    
-                    score = similarity_matrix[job_idx][resume_idx]
-                    if score > best_score:
-                        best_score = score
-                        best_match = resume_skill
-                
-                if best_score > 0.7:
+        for job_skill in job_desc_skills:
+            found = False
+            for resume_skill in resume_skills:
+                if job_skill.lower() == resume_skill.lower():
                     matched_skills.append({
                         'job_skill': job_skill,
-                        'resume_skill': best_match,
-                        'similarity': best_score
+                        'resume_skill': resume_skill,
+                        'similarity': 1.0
                     })
-                elif best_score > 0.3:
+                    found = True
+                    break
+                elif job_skill in resume_skill or resume_skill in job_skill:
                     partial_matches.append({
                         'job_skill': job_skill,
-                        'resume_skill': best_match,
-                        'similarity': best_score
-                    })
-                else:
-                    missing_skills.append({
-                        'skill': job_skill,
-                        'similarity': best_score
+                        'resume_skill': resume_skill,
+                        'similarity': 0.5
                     })
-        else:
-            # Fallback to string matching
-            for job_skill in job_desc_skills:
-                found = False
-                for resume_skill in resume_skills:
-                    if job_skill.lower() == resume_skill.lower():
-                        matched_skills.append({
-                            'job_skill': job_skill,
-                            'resume_skill': resume_skill,
-                            'similarity': 1.0
-                        })
-                        found = True
-                        break
-                    elif job_skill in resume_skill or resume_skill in job_skill:
-                        partial_matches.append({
-                            'job_skill': job_skill,
-                            'resume_skill': resume_skill,
-                            'similarity': 0.5
-                        })
-                        found = True
-                        break
-                
-                if not found:
-                    missing_skills.append({
-                        'skill': job_skill,
-                        'similarity': 0.0
-                    })
-        
-        total_skills = len(job_desc_skills)
-        if total_skills > 0:
-            overall_match = (len(matched_skills) * 1.0 + len(partial_matches) * 0.5) / total_skills * 100
-        else:
-            overall_match = 0
+                    found = True
+                    break
+            
+            if not found:
+                missing_skills.append({
+                    'skill': job_skill,
+                    'similarity': 0.0
+                })
         
-        return {
+        return SkillAnalysis.from_dict({
             'matched_skills': matched_skills,
             'partial_matches': partial_matches,
-            'missing_skills': missing_skills,
-            'overall_match': overall_match,
-            'high_match_count': len(matched_skills),
-            'partial_match_count': len(partial_matches),
-            'missing_count': len(missing_skills)
-        }
+            'missing_skills': missing_skills
+        })
+    
+    def _tier_matches(self, resume_skills, job_desc_skills, similarity):
+        # best match per job skill is a row-wise argmax of the job x resume block
+        if resume_skills and similarity is not None:
+            best_idx = similarity.argmax(axis=1)
+            best_scores = similarity[np.arange(len(job_desc_skills)), best_idx]
+        else:
+            best_idx = np.zeros(len(job_desc_skills), dtype=np.intp)
+            best_scores = np.zeros(len(job_desc_skills), dtype=np.float32)
+        
+        # a best score never drops below 0, which also means "no match"
+        best_scores = np.maximum(best_scores, 0)
+        # skills are stored as ids into the embedded vocabulary
+        vocabulary = self.nlp.vocabulary_embeddings
+        return SkillAnalysis.from_scores(
+            job_desc_skills, resume_skills, best_idx, best_scores,
+            vocabulary.vocabulary, vocabulary.index
+        )
     
     def _calculate_compatibility(self, skill_analysis):
         skill_score = skill_analysis['overall_match']
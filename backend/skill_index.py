@@ -0,0 +1,369 @@
+# backend/skill_index.py
+
+import heapq
+import re
+import threading
+from array import array
+from bisect import bisect_left
+
+from .skill_taxonomy import load_taxonomy, normalize_skill
+
+# unsigned 32-bit resume ids, kept sorted in every posting list
+_TYPECODE = "I"
+
+_OPERATORS = ("AND", "OR", "NOT")
+# operators in any case; quote a skill that contains one ("research and development")
+_QUERY_TOKEN_RE = re.compile(
+    r'\(|\)|\b(?:AND|OR|NOT)\b|"[^"]*"|[^()"]+?(?=\s*(?:\(|\)|\b(?:AND|OR|NOT)\b|$))', re.IGNORECASE
+)
+
+
+def _contains(postings, resume_id):
+    i = bisect_left(postings, resume_id)
+    return i < len(postings) and postings[i] == resume_id
+
+
+def _intersect(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    if not a:
+        return array(_TYPECODE)
+    # a short list against a long one: binary-search each id instead of merging
+    if len(a) * 16 < len(b):
+        return array(_TYPECODE, (x for x in a if _contains(b, x)))
+    out = array(_TYPECODE)
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i] == b[j]:
+            out.append(a[i])
+            i += 1
+            j += 1
+        elif a[i] < b[j]:
+            i += 1
+        else:
+            j += 1
+    return out
+
+
+def _union(a, b):
+    out = array(_TYPECODE)
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i] == b[j]:
+            out.append(a[i])
+            i += 1
+            j += 1
+        elif a[i] < b[j]:
+            out.append(a[i])
+            i += 1
+        else:
+            out.append(b[j])
+            j += 1
+    out.extend(a[i:])
+    out.extend(b[j:])
+    return out
+
+
+def _difference(a, b):
+    return array(_TYPECODE, (x for x in a if not _contains(b, x)))
+
+
+def _insert_sorted(postings_by_skill, skill, resume_id):
+    postings = postings_by_skill.get(skill)
+    if postings is None:
+        postings = postings_by_skill[skill] = array(_TYPECODE)
+    # ids are usually new and largest, so this is an append
+    if not postings or postings[-1] < resume_id:
+        postings.append(resume_id)
+    elif not _contains(postings, resume_id):
+        postings.insert(bisect_left(postings, resume_id), resume_id)
+
+
+class SkillIndex:
+    """Inverted index from skill to the sorted ids of resumes that mention it.
+
+    Posting lists live in memory as sorted uint32 arrays and are persisted in
+    the skill_postings table, so new uploads are added incrementally instead
+    of re-extracting skills from every stored resume. An upload only writes
+    one skill_postings_delta row per skill; the delta is folded into the
+    posting BLOBs once it holds MERGE_THRESHOLD rows.
+
+    Postings are keyed by canonical taxonomy ids and queries accept aliases.
+    When the taxonomy has changed since the postings were built, needs_rebuild
+    is set and the old postings are served until rebuild() (normally the
+    rebuild_skill_index job) replaces them.
+    """
+
+    MERGE_THRESHOLD = 10000
+    REBUILD_BATCH_SIZE = 256
+
+    def __init__(self, db, taxonomy=None):
+        self.db = db
+        # the same taxonomy NLPProcessor extracts with
+        self.taxonomy = taxonomy or load_taxonomy()
+        self._lock = threading.Lock()
+        self._postings = {}
+        self._all_ids = array(_TYPECODE)
+        self._pending = 0
+        self._load()
+        self.needs_rebuild = self._stored_taxonomy_hash() != self.taxonomy.hash
+
+    def _load(self):
+        with self.db.pool.connection() as conn:
+            for skill, blob in conn.execute("SELECT skill, resume_ids FROM skill_postings"):
+                postings = array(_TYPECODE)
+                postings.frombytes(blob)
+                self._postings[skill] = postings
+            for skill, resume_id in conn.execute("SELECT skill, resume_id FROM skill_postings_delta"):
+                self._insert(skill, resume_id)
+                self._pending += 1
+            self._all_ids = array(
+                _TYPECODE,
+                (row[0] for row in conn.execute("SELECT resume_id FROM indexed_resumes ORDER BY resume_id"))
+            )
+
+    def __len__(self):
+        return len(self._all_ids)
+
+    def __contains__(self, resume_id):
+        with self._lock:
+            return _contains(self._all_ids, resume_id)
+
+    def missing(self, resume_ids):
+        """The ids in resume_ids that are not indexed yet."""
+        with self._lock:
+            return [resume_id for resume_id in resume_ids if not _contains(self._all_ids, resume_id)]
+
+    def _stored_taxonomy_hash(self):
+        with self.db.pool.connection() as conn:
+            row = conn.execute("SELECT value FROM skill_index_meta WHERE key = 'taxonomy_hash'").fetchone()
+        return row[0] if row else None
+
+    def rebuild(self, progress=None):
+        """Re-extract the skills of every indexed resume and replace all postings.
+
+        Extraction runs without the lock, so queries keep using the old
+        postings until the new ones are swapped in; resumes added meanwhile
+        are carried over.
+        """
+        from .nlp_processor import NLPProcessor
+        with self._lock:
+            snapshot = array(_TYPECODE, self._all_ids)
+        postings = {}
+        if len(snapshot):
+            processor = NLPProcessor()
+            try:
+                for start in range(0, len(snapshot), self.REBUILD_BATCH_SIZE):
+                    if progress is not None:
+                        progress(start / len(snapshot), f"Re-indexed {start} of {len(snapshot)} resumes")
+                    ids = snapshot[start:start + self.REBUILD_BATCH_SIZE].tolist()
+                    texts = self.db.get_documents(ids)
+                    ids = [resume_id for resume_id in ids if resume_id in texts]
+                    extracted = processor.extract_skills_batch([texts[resume_id] for resume_id in ids])
+                    # ids ascend, so every list stays sorted
+                    for resume_id, skills in zip(ids, extracted):
+                        for skill in set(skills):
+                            postings.setdefault(skill, array(_TYPECODE)).append(resume_id)
+            finally:
+                processor.close()
+
+        with self._lock:
+            # uploads indexed during the rebuild were extracted with the new taxonomy
+            added = _difference(self._all_ids, snapshot)
+            if len(added):
+                for skill, resume_ids in self._postings.items():
+                    for resume_id in _intersect(resume_ids, added):
+                        _insert_sorted(postings, skill, resume_id)
+
+            with self.db.pool.connection() as conn:
+                conn.execute("DELETE FROM skill_postings")
+                conn.execute("DELETE FROM skill_postings_delta")
+                conn.executemany(
+                    "INSERT INTO skill_postings (skill, resume_ids) VALUES (?, ?)",
+                    [(skill, resume_ids.tobytes()) for skill, resume_ids in postings.items()]
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO skill_index_meta (key, value) VALUES ('taxonomy_hash', ?)",
+                    (self.taxonomy.hash,)
+                )
+            self._postings = postings
+            self._pending = 0
+            self.needs_rebuild = False
+
+    def _insert(self, skill, resume_id):
+        _insert_sorted(self._postings, skill, resume_id)
+
+    def add_resume(self, resume_id, skills):
+        """Index one stored resume; re-adding an indexed id is a no-op."""
+        with self._lock:
+            if _contains(self._all_ids, resume_id):
+                return False
+            skills = set(skills)
+
+            # persist first so a failed write leaves the in-memory index untouched
+            with self.db.pool.connection() as conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO skill_postings_delta (skill, resume_id) VALUES (?, ?)",
+                    [(skill, resume_id) for skill in skills]
+                )
+                conn.execute("INSERT OR IGNORE INTO indexed_resumes (resume_id) VALUES (?)", (resume_id,))
+            for skill in skills:
+                self._insert(skill, resume_id)
+            self._all_ids.insert(bisect_left(self._all_ids, resume_id), resume_id)
+            self._pending += len(skills)
+            if self._pending >= self.MERGE_THRESHOLD:
+                self._merge()
+            return True
+
+    def _merge(self):
+        # rewrite only the posting BLOBs the delta touches, then clear it
+        with self.db.pool.connection() as conn:
+            skills = [row[0] for row in conn.execute("SELECT DISTINCT skill FROM skill_postings_delta")]
+            conn.executemany(
+                "INSERT OR REPLACE INTO skill_postings (skill, resume_ids) VALUES (?, ?)",
+                [(skill, self._postings[skill].tobytes()) for skill in skills if skill in self._postings]
+            )
+            conn.execute("DELETE FROM skill_postings_delta")
+        self._pending = 0
+
+    def merge(self):
+        """Fold pending delta rows into the posting BLOBs now."""
+        with self._lock:
+            self._merge()
+
+    def canonical(self, skill):
+        # aliases ("k8s") resolve to the id postings are stored under ("kubernetes")
+        return self.taxonomy.canonical(skill) or normalize_skill(skill)
+
+    def postings(self, skill):
+        return self._postings.get(self.canonical(skill), array(_TYPECODE))
+
+    def search(self, all_of=(), any_of=(), none_of=()):
+        """Ids of resumes with every skill in all_of, at least one of any_of and none of none_of."""
+        with self._lock:
+            # intersect the rarest lists first so intermediate results stay small
+            required = sorted((self.postings(skill) for skill in all_of), key=len)
+            if required:
+                result = required[0]
+                for postings in required[1:]:
+                    result = _intersect(result, postings)
+            else:
+                result = self._all_ids
+
+            if any_of:
+                alternatives = array(_TYPECODE)
+                for skill in any_of:
+                    alternatives = _union(alternatives, self.postings(skill))
+                result = _intersect(result, alternatives)
+
+            for skill in none_of:
+                result = _difference(result, self.postings(skill))
+            return list(result)
+
+    def query(self, text):
+        """Boolean query such as 'kubernetes AND terraform AND NOT java'.
+
+        Supports AND, OR, NOT (in any case) and parentheses; multi-word skills
+        can be written as-is or quoted ("spring boot"). NOT binds tighter than
+        AND, AND tighter than OR.
+        """
+        tokens = [token.strip() for token in _QUERY_TOKEN_RE.findall(text) if token.strip()]
+        tokens = [token.upper() if token.upper() in _OPERATORS else token for token in tokens]
+        with self._lock:
+            parser = _QueryParser(tokens, self)
+            result = parser.parse()
+        return list(result)
+
+    def rank(self, job_skills, k=10):
+        """Top-k resumes by job-skill coverage, scored like _match_skills with exact matches only."""
+        job_skills = list(dict.fromkeys(self.canonical(skill) for skill in job_skills))
+        if not job_skills:
+            return []
+        with self._lock:
+            hits = {}
+            for skill in job_skills:
+                for resume_id in self._postings.get(skill, ()):
+                    hits[resume_id] = hits.get(resume_id, 0) + 1
+        best = heapq.nlargest(k, hits.items(), key=lambda item: (item[1], -item[0]))
+        return [{
+            "resume_id": resume_id,
+            "matched_count": matched,
+            "coverage": matched / len(job_skills) * 100
+        } for resume_id, matched in best]
+
+
+class _QueryParser:
+    # or_expr := and_expr (OR and_expr)*
+    # and_expr := not_expr (AND not_expr)*
+    # not_expr := NOT not_expr | term
+    # term := skill | ( or_expr )
+
+    def __init__(self, tokens, index):
+        self.tokens = tokens
+        self.pos = 0
+        self.index = index
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _take(self):
+        token = self._peek()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            return array(_TYPECODE)
+        result = self._or_expr()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected '{self._peek()}' in skill query")
+        return result
+
+    def _or_expr(self):
+        result = self._and_expr()
+        while self._peek() == "OR":
+            self._take()
+            result = _union(result, self._and_expr())
+        return result
+
+    def _and_expr(self):
+        result = self._not_expr()
+        while self._peek() == "AND":
+            self._take()
+            result = _intersect(result, self._not_expr())
+        return result
+
+    def _not_expr(self):
+        if self._peek() == "NOT":
+            self._take()
+            return _difference(self.index._all_ids, self._not_expr())
+        return self._term()
+
+    def _term(self):
+        token = self._take()
+        if token is None or token in ("AND", "OR", ")"):
+            raise ValueError("Incomplete skill query")
+        if token == "(":
+            result = self._or_expr()
+            if self._take() != ")":
+                raise ValueError("Missing ')' in skill query")
+            return result
+        return self.index.postings(token.strip('"'))
+
+
+def rebuild_skill_index(index, progress=None):
+    # job-queue entry point for a rebuild after a taxonomy change
+    index.rebuild(progress=progress)
+    return len(index)
+
+
+def index_resume_text(index, resume_id, text, progress=None):
+    # job-queue entry point: extract skills off the page thread, then index them
+    from .nlp_processor import NLPProcessor
+    processor = NLPProcessor()
+    try:
+        skills = processor.extract_skills(text)
+    finally:
+        processor.close()
+    index.add_resume(resume_id, skills)
+    return len(skills)
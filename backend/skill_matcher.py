@@ -0,0 +1,157 @@
+# backend/skill_matcher.py
+
+import re
+from collections import deque
+from collections.abc import Mapping
+
+# word runs, or single punctuation characters ("c", "#" / "node", ".", "js")
+_TOKEN_RE = re.compile(r'\w+|[^\w\s]')
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over a fixed keyword set.
+
+    Built once from the keywords and then run over a text in a single pass,
+    so the cost of a scan does not grow with the size of the vocabulary.
+    """
+
+    def __init__(self, keywords):
+        # goto transitions, failure links and output keyword lists per state
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for keyword in keywords:
+            if keyword:
+                self._add(keyword)
+        self._build_failure_links()
+
+    def _add(self, keyword):
+        state = 0
+        for char in keyword:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        if keyword not in self._out[state]:
+            self._out[state].append(keyword)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = link if link != nxt else 0
+                # inherit the outputs of the longest proper suffix
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    @staticmethod
+    def _is_boundary(text, index):
+        # outside the text, or a character that can't continue a word
+        if index < 0 or index >= len(text):
+            return True
+        char = text[index]
+        return not (char.isalnum() or char == '_')
+
+    def find_matches(self, text: str):
+        """Return (start, end, keyword) for every keyword found on token boundaries."""
+        if not text:
+            return []
+
+        goto, fail, out = self._goto, self._fail, self._out
+        matches = []
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            for keyword in out[state]:
+                start = end - len(keyword)
+                if self._is_boundary(text, start - 1) and self._is_boundary(text, end):
+                    matches.append((start, end, keyword))
+        matches.sort()
+        return matches
+
+    def find_keywords(self, text: str):
+        return {keyword for _, _, keyword in self.find_matches(text)}
+
+
+class TokenPhraseMatcher:
+    """Phrase lookup over word/punctuation tokens, for taxonomies too large for a char trie.
+
+    Every phrase is stored under its token key (tokens joined by a space
+    where the phrase had whitespace between them, so "node.js" and
+    "spring  boot" key as "node.js" and "spring boot"). A scan looks up
+    each token run in a hash table and only extends a run while it is
+    the prefix of some phrase, so the cost of a scan depends on the text
+    and the longest phrase, not on how many phrases there are.
+    """
+
+    def __init__(self, phrases):
+        # phrases: keywords, or a mapping of keyword -> value reported for it
+        items = phrases.items() if isinstance(phrases, Mapping) else ((phrase, phrase) for phrase in phrases)
+        self._phrases = {}
+        self._prefixes = set()
+        for phrase, value in items:
+            key = None
+            for match, spaced in self._tokens(phrase):
+                key = match.group() if key is None else key + (" " if spaced else "") + match.group()
+                self._prefixes.add(key)
+            if key is not None:
+                self._phrases.setdefault(key, value)
+
+    @staticmethod
+    def _tokens(text):
+        # each token with whether whitespace separates it from the one before
+        end = 0
+        for match in _TOKEN_RE.finditer(text):
+            yield match, match.start() > end
+            end = match.end()
+
+    def __len__(self):
+        return len(self._phrases)
+
+    def find_matches(self, text: str):
+        """Return (start, end, value) for every phrase found on token boundaries."""
+        if not text:
+            return []
+
+        phrases, prefixes, is_boundary = self._phrases, self._prefixes, SkillMatcher._is_boundary
+        tokens = list(_TOKEN_RE.finditer(text))
+        matches = []
+        for i, first in enumerate(tokens):
+            key = first.group()
+            if key not in prefixes:
+                continue
+            start = first.start()
+            # punctuation-led phrases (".net") still need a word boundary before them
+            if not is_boundary(text, start - 1):
+                continue
+            j, end = i, first.end()
+            while True:
+                value = phrases.get(key)
+                if value is not None and is_boundary(text, end):
+                    matches.append((start, end, value))
+                j += 1
+                if j == len(tokens):
+                    break
+                token = tokens[j]
+                key = key + (" " if token.start() > end else "") + token.group()
+                if key not in prefixes:
+                    break
+                end = token.end()
+        return matches
+
+    def find_keywords(self, text: str):
+        return {value for _, _, value in self.find_matches(text)}
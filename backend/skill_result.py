@@ -0,0 +1,280 @@
+# backend/skill_result.py
+
+import json
+import struct
+from collections.abc import Mapping, Sequence
+import numpy as np
+
+HIGH, PARTIAL, MISSING = 0, 1, 2
+TIER_NAMES = ("high", "partial", "missing")
+
+# keys of the dict _match_skills used to return, still served by SkillAnalysis
+LEGACY_KEYS = ("matched_skills", "partial_matches", "missing_skills", "overall_match",
+               "high_match_count", "partial_match_count", "missing_count")
+
+# first byte of to_bytes() output
+_MSGPACK_FORMAT = b"M"
+_RAW_FORMAT = b"R"
+
+
+class _OverflowVocabulary(Sequence):
+    """A shared vocabulary followed by the few skills of one result that are not in it.
+
+    Ids below len(base) index the shared list, which is never copied.
+    """
+
+    __slots__ = ("base", "base_index", "extra", "extra_index")
+
+    def __init__(self, base, base_index):
+        self.base = base
+        self.base_index = base_index
+        self.extra = []
+        self.extra_index = {}
+
+    def __len__(self):
+        return len(self.base) + len(self.extra)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return self.base[i] if i < len(self.base) else self.extra[i - len(self.base)]
+
+    def get(self, skill, default=None):
+        i = self.base_index.get(skill)
+        if i is not None:
+            return i
+        i = self.extra_index.get(skill)
+        return default if i is None else len(self.base) + i
+
+    def add(self, skill):
+        i = self.get(skill)
+        if i is None:
+            i = len(self)
+            self.extra_index[skill] = len(self.extra)
+            self.extra.append(skill)
+        return i
+
+
+def _intern(skills, vocabulary, index):
+    # ids into the shared vocabulary; skills outside it go to a small overflow table
+    ids = [index.get(skill, -1) for skill in skills]
+    if -1 in ids:
+        if not isinstance(vocabulary, _OverflowVocabulary):
+            vocabulary = _OverflowVocabulary(vocabulary, index)
+        for i, skill in enumerate(skills):
+            if ids[i] == -1:
+                ids[i] = vocabulary.add(skill)
+        index = vocabulary
+    return np.array(ids, dtype=np.int32), vocabulary, index
+
+
+def _readonly(array):
+    array.setflags(write=False)
+    return array
+
+
+class SkillAnalysis(Mapping):
+    """Match result for one resume/job pair, stored as parallel arrays.
+
+    One row per job skill, in job-description order: the job skill and its
+    best resume skill as int ids into vocabulary (-1 when nothing matched),
+    the float32 cosine score and the tier (HIGH, PARTIAL or MISSING). It is
+    also a read-only Mapping with the old dict keys, so result["matched_skills"]
+    and friends still return lists of per-skill dicts. Those lists are built
+    fresh on every access, so a caller mutating one never changes the result.
+    """
+
+    __slots__ = ("vocabulary", "job_skill_ids", "resume_skill_ids", "similarity", "tiers")
+
+    def __init__(self, vocabulary, job_skill_ids, resume_skill_ids, similarity, tiers):
+        self.vocabulary = vocabulary
+        self.job_skill_ids = _readonly(np.asarray(job_skill_ids, dtype=np.int32))
+        self.resume_skill_ids = _readonly(np.asarray(resume_skill_ids, dtype=np.int32))
+        self.similarity = _readonly(np.asarray(similarity, dtype=np.float32))
+        self.tiers = _readonly(np.asarray(tiers, dtype=np.int8))
+
+    @classmethod
+    def from_scores(cls, job_desc_skills, resume_skills, best_idx, best_scores, vocabulary=(), index=None):
+        """Tier best-match scores: > 0.7 is high, > 0.3 partial, anything else missing."""
+        best_scores = np.asarray(best_scores, dtype=np.float32)
+        tiers = np.full(len(best_scores), MISSING, dtype=np.int8)
+        tiers[best_scores > 0.3] = PARTIAL
+        tiers[best_scores > 0.7] = HIGH
+
+        index = index if index is not None else {skill: i for i, skill in enumerate(vocabulary)}
+        job_ids, vocabulary, index = _intern(job_desc_skills, vocabulary, index)
+        resume_ids = np.full(len(job_desc_skills), -1, dtype=np.int32)
+        if resume_skills:
+            resume_vocab_ids, vocabulary, index = _intern(resume_skills, vocabulary, index)
+            matched = tiers != MISSING
+            resume_ids[matched] = resume_vocab_ids[np.asarray(best_idx)[matched]]
+        return cls(vocabulary, job_ids, resume_ids, best_scores, tiers)
+
+    @classmethod
+    def from_dict(cls, skill_analysis):
+        """Rebuild from the dict shape, e.g. a result loaded back from JSON."""
+        if isinstance(skill_analysis, SkillAnalysis):
+            return skill_analysis
+        rows = [(skill["job_skill"], skill["resume_skill"], skill["similarity"], HIGH)
+                for skill in skill_analysis["matched_skills"]]
+        rows += [(skill["job_skill"], skill["resume_skill"], skill["similarity"], PARTIAL)
+                 for skill in skill_analysis["partial_matches"]]
+        rows += [(skill["skill"], None, skill["similarity"], MISSING)
+                 for skill in skill_analysis["missing_skills"]]
+        index, job_ids, resume_ids = {}, [], []
+        for job_skill, resume_skill, _, _ in rows:
+            job_ids.append(index.setdefault(job_skill, len(index)))
+            resume_ids.append(-1 if resume_skill is None else index.setdefault(resume_skill, len(index)))
+        return cls(list(index), job_ids, resume_ids, [row[2] for row in rows], [row[3] for row in rows])
+
+    @classmethod
+    def empty(cls):
+        return cls([], [], [], [], [])
+
+    def __len__(self):
+        return len(LEGACY_KEYS)
+
+    def __iter__(self):
+        return iter(LEGACY_KEYS)
+
+    def __getitem__(self, key):
+        if key == "matched_skills":
+            return self._skill_dicts(HIGH)
+        if key == "partial_matches":
+            return self._skill_dicts(PARTIAL)
+        if key == "missing_skills":
+            return [{"skill": self.vocabulary[job_id], "similarity": score}
+                    for job_id, score in self._rows(MISSING)]
+        if key == "overall_match":
+            return self.overall_match
+        if key == "high_match_count":
+            return self.count(HIGH)
+        if key == "partial_match_count":
+            return self.count(PARTIAL)
+        if key == "missing_count":
+            return self.count(MISSING)
+        raise KeyError(key)
+
+    def _rows(self, tier):
+        rows = np.flatnonzero(self.tiers == tier)
+        return zip(self.job_skill_ids[rows].tolist(), self.similarity[rows].tolist())
+
+    def _skill_dicts(self, tier):
+        rows = np.flatnonzero(self.tiers == tier)
+        return [{
+            "job_skill": self.vocabulary[job_id],
+            "resume_skill": self.vocabulary[resume_id],
+            "similarity": score
+        } for job_id, resume_id, score in zip(
+            self.job_skill_ids[rows].tolist(), self.resume_skill_ids[rows].tolist(), self.similarity[rows].tolist()
+        )]
+
+    def count(self, tier):
+        return int(np.count_nonzero(self.tiers == tier))
+
+    @property
+    def overall_match(self):
+        if not len(self.tiers):
+            return 0
+        return (self.count(HIGH) * 1.0 + self.count(PARTIAL) * 0.5) / len(self.tiers) * 100
+
+    # arrays are read-only and nothing else is mutable, so copies can share them
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return SkillAnalysis.from_bytes, (self.to_bytes(),)
+
+    def to_dict(self):
+        """The plain dict shape, for JSON and anything that needs a real dict."""
+        return {key: self[key] for key in LEGACY_KEYS}
+
+    def to_dataframe(self, tier=None):
+        """Columns job_skill, resume_skill (categoricals over this result's skills), similarity and tier.
+
+        Skill columns are dictionary-encoded against only the skills this
+        result uses, so the cost does not grow with the taxonomy; pass a tier
+        to get only those rows.
+        """
+        import pandas as pd
+        rows = slice(None) if tier is None else self.tiers == tier
+        skills, job_codes, resume_codes = self._compact()
+        categories = pd.Index(skills, dtype=object)
+        return pd.DataFrame({
+            "job_skill": pd.Categorical.from_codes(job_codes[rows], categories=categories),
+            "resume_skill": pd.Categorical.from_codes(resume_codes[rows], categories=categories),
+            "similarity": self.similarity[rows],
+            "tier": pd.Categorical.from_codes(self.tiers[rows], categories=TIER_NAMES),
+        }, copy=False)
+
+    def to_arrow(self):
+        import pyarrow as pa
+        skills, job_codes, resume_codes = self._compact()
+        dictionary = pa.array(skills, type=pa.string())
+        return pa.table({
+            "job_skill": pa.DictionaryArray.from_arrays(pa.array(job_codes), dictionary),
+            "resume_skill": pa.DictionaryArray.from_arrays(
+                pa.array(resume_codes, mask=resume_codes < 0), dictionary),
+            "similarity": pa.array(self.similarity),
+            "tier": pa.array(self.tiers),
+        })
+
+    def _compact(self):
+        # renumber against only the skills this result uses
+        used = np.union1d(self.job_skill_ids, self.resume_skill_ids[self.resume_skill_ids >= 0])
+        job_codes = np.searchsorted(used, self.job_skill_ids).astype(np.int32)
+        resume_codes = np.where(
+            self.resume_skill_ids >= 0, np.searchsorted(used, self.resume_skill_ids), -1
+        ).astype(np.int32)
+        return [self.vocabulary[i] for i in used.tolist()], job_codes, resume_codes
+
+    def to_bytes(self):
+        """Compact binary form: msgpack when installed, else a JSON header plus raw arrays."""
+        skills, job_codes, resume_codes = self._compact()
+        arrays = (job_codes, resume_codes, self.similarity, self.tiers)
+        try:
+            import msgpack
+        except ImportError:
+            header = json.dumps({"skills": skills, "rows": len(self.tiers)}).encode("utf-8")
+            return _RAW_FORMAT + struct.pack("<I", len(header)) + header + b"".join(
+                np.ascontiguousarray(array).tobytes() for array in arrays)
+        return _MSGPACK_FORMAT + msgpack.packb({
+            "skills": skills,
+            "arrays": [np.ascontiguousarray(array).tobytes() for array in arrays],
+        })
+
+    @classmethod
+    def from_bytes(cls, data):
+        data = memoryview(data)
+        dtypes = (np.int32, np.int32, np.float32, np.int8)
+        if bytes(data[:1]) == _MSGPACK_FORMAT:
+            import msgpack
+            payload = msgpack.unpackb(data[1:])
+            arrays = [np.frombuffer(raw, dtype=dtype) for raw, dtype in zip(payload["arrays"], dtypes)]
+            return cls(payload["skills"], *arrays)
+
+        (header_size,) = struct.unpack_from("<I", data, 1)
+        header = json.loads(bytes(data[5:5 + header_size]))
+        offset, arrays = 5 + header_size, []
+        for dtype in dtypes:
+            arrays.append(np.frombuffer(data, dtype=dtype, count=header["rows"], offset=offset))
+            offset += header["rows"] * np.dtype(dtype).itemsize
+        return cls(header["skills"], *arrays)
+
+    def __repr__(self):
+        return (f"SkillAnalysis(high={self.count(HIGH)}, partial={self.count(PARTIAL)}, "
+                f"missing={self.count(MISSING)})")
+
+
+def json_default(value):
+    """json.dumps default= hook that writes a SkillAnalysis in its dict shape."""
+    if isinstance(value, SkillAnalysis):
+        return value.to_dict()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
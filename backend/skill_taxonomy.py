@@ -0,0 +1,93 @@
+# backend/skill_taxonomy.py
+
+import csv
+import hashlib
+import json
+import os
+import threading
+
+from .skill_matcher import TokenPhraseMatcher
+
+# SKILL_TAXONOMY_PATH points at a replacement taxonomy (JSON or CSV)
+TAXONOMY_PATH_ENV = "SKILL_TAXONOMY_PATH"
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "data", "skill_taxonomy.json")
+# CSV taxonomies list aliases in one column, separated by this character
+CSV_ALIAS_SEPARATOR = "|"
+
+
+def normalize_skill(surface):
+    return " ".join(surface.lower().split())
+
+
+class SkillTaxonomy:
+    """Canonical skill ids, their aliases and categories, compiled into one matcher.
+
+    Every id and alias is a surface form mapped to its canonical id, so
+    "k8s" and "kubernetes" both extract as "kubernetes". When two entries
+    claim the same surface form, the first one wins.
+    """
+
+    def __init__(self, entries):
+        self.categories = {}
+        self.surface_forms = {}
+        for entry in entries:
+            skill_id = normalize_skill(entry["id"])
+            if not skill_id:
+                continue
+            self.categories.setdefault(skill_id, entry.get("category"))
+            for surface in [skill_id, *(entry.get("aliases") or ())]:
+                surface = normalize_skill(surface)
+                if surface:
+                    self.surface_forms.setdefault(surface, skill_id)
+        self.skills = frozenset(self.categories)
+        self.matcher = TokenPhraseMatcher(self.surface_forms)
+        joined = "\n".join(f"{surface}\t{skill_id}" for surface, skill_id in sorted(self.surface_forms.items()))
+        self.hash = hashlib.sha256(joined.encode("utf-8")).hexdigest()
+
+    def __len__(self):
+        return len(self.skills)
+
+    def __contains__(self, skill):
+        return skill in self.skills
+
+    def canonical(self, surface):
+        """The canonical id for an id or alias, or None if it isn't in the taxonomy."""
+        return self.surface_forms.get(normalize_skill(surface))
+
+    def find_skills(self, text_lower):
+        return self.matcher.find_keywords(text_lower)
+
+
+def read_taxonomy_entries(path):
+    """Entries as dicts with id, aliases and category, from a .json or .csv file."""
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            return [{
+                "id": row["id"],
+                "category": row.get("category") or None,
+                "aliases": [alias for alias in (row.get("aliases") or "").split(CSV_ALIAS_SEPARATOR) if alias.strip()],
+            } for row in csv.DictReader(f)]
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["skills"] if isinstance(data, dict) else data
+
+
+_taxonomies = {}
+_taxonomy_lock = threading.Lock()
+
+
+def load_taxonomy(path=None):
+    """The compiled taxonomy at path (default: $SKILL_TAXONOMY_PATH or the bundled file).
+
+    Compiled once per process and shared by every NLPProcessor; reloaded
+    only when the file changes on disk.
+    """
+    path = os.path.abspath(path or os.environ.get(TAXONOMY_PATH_ENV) or DEFAULT_TAXONOMY_PATH)
+    mtime = os.path.getmtime(path)
+    with _taxonomy_lock:
+        cached = _taxonomies.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, SkillTaxonomy(read_taxonomy_entries(path)))
+            _taxonomies[path] = cached
+        return cached[1]
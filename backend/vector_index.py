@@ -0,0 +1,229 @@
+# backend/vector_index.py
+
+import json
+import os
+import re
+import threading
+import numpy as np
+
+from .embedding_cache import DEFAULT_CACHE_DIR, normalize_rows
+
+# one subdirectory per embedding model, so vectors from different models never mix
+DEFAULT_INDEX_DIR = os.path.join(DEFAULT_CACHE_DIR, "resume_vectors")
+
+
+class VectorIndex:
+    """On-disk IVF index over normalized resume embeddings.
+
+    Vectors are appended to a float16 file that is memory-mapped for search.
+    Once trained, k-means centroids split the rows into inverted lists and a
+    query only scores the rows in its n_probe nearest lists; before that (or
+    for small collections) search falls back to an exact scan.
+    """
+
+    # below this many vectors an exact scan is cheap enough
+    TRAIN_AT = 4096
+
+    def __init__(self, path=None, model_id=None):
+        if model_id is None:
+            from .embedding_backends import configured_model_id
+            model_id = configured_model_id()
+        self.model_id = model_id
+        path = path or os.path.join(DEFAULT_INDEX_DIR, re.sub(r'[^A-Za-z0-9_.-]', '_', model_id))
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._ids_file = os.path.join(path, "ids.i64")
+        self._vectors_file = os.path.join(path, "vectors.f16")
+        self._lists_file = os.path.join(path, "lists.i32")
+        self._centroids_file = os.path.join(path, "centroids.npy")
+        self._meta_file = os.path.join(path, "meta.json")
+        self.dim = None
+        self._load()
+
+    def _load(self):
+        if os.path.exists(self._meta_file):
+            with open(self._meta_file, encoding="utf-8") as f:
+                meta = json.load(f)
+            # indexes from before model ids were recorded are taken as they are
+            if meta.get("model_id", self.model_id) != self.model_id:
+                raise ValueError(f"Vector index at {self.path} holds {meta['model_id']} embeddings, "
+                                 f"not {self.model_id}")
+            self.dim = meta["dim"]
+        self.ids = np.fromfile(self._ids_file, dtype=np.int64) if os.path.exists(self._ids_file) else \
+            np.empty(0, dtype=np.int64)
+        self.lists = np.fromfile(self._lists_file, dtype=np.int32) if os.path.exists(self._lists_file) else \
+            np.empty(0, dtype=np.int32)
+        self.centroids = np.load(self._centroids_file) if os.path.exists(self._centroids_file) else None
+        self._truncate_partial_append()
+        self._map_vectors()
+
+    def _truncate_partial_append(self):
+        # an append interrupted between files leaves rows past the last id;
+        # cut every file back to the rows all three agree on
+        vector_rows = 0
+        if self.dim and os.path.exists(self._vectors_file):
+            vector_rows = os.path.getsize(self._vectors_file) // (self.dim * 2)
+        rows = min(len(self.ids), len(self.lists), vector_rows)
+        for file, row_bytes in ((self._ids_file, 8), (self._lists_file, 4), (self._vectors_file, (self.dim or 0) * 2)):
+            if os.path.exists(file) and os.path.getsize(file) > rows * row_bytes:
+                os.truncate(file, rows * row_bytes)
+        self.ids, self.lists = self.ids[:rows], self.lists[:rows]
+
+    def _map_vectors(self):
+        self.vectors = None
+        if self.dim and len(self.ids):
+            self.vectors = np.memmap(self._vectors_file, dtype=np.float16, mode="r",
+                                     shape=(len(self.ids), self.dim))
+        self._list_rows = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, resume_id):
+        with self._lock:
+            return bool(np.any(self.ids == resume_id))
+
+    def missing(self, ids):
+        """The ids that have no stored vector yet."""
+        ids = np.asarray(ids, dtype=np.int64)
+        with self._lock:
+            return ids[~np.isin(ids, self.ids)].tolist()
+
+    @property
+    def trained(self):
+        return self.centroids is not None
+
+    def check_model(self, model_id):
+        if model_id != self.model_id:
+            raise ValueError(f"Vector index holds {self.model_id} embeddings, not {model_id}")
+
+    def add(self, ids, vectors):
+        """Append vectors for new ids; ids already in the index are skipped."""
+        added = self._append(ids, vectors)
+        if added and not self.trained and len(self.ids) >= self.TRAIN_AT:
+            self.train()
+        return added
+
+    def _append(self, ids, vectors):
+        vectors = normalize_rows(vectors)
+        ids = np.asarray(ids, dtype=np.int64)
+        with self._lock:
+            new = ~np.isin(ids, self.ids)
+            ids, vectors = ids[new], vectors[new]
+            if not len(ids):
+                return 0
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                with open(self._meta_file, "w", encoding="utf-8") as f:
+                    json.dump({"dim": self.dim, "model_id": self.model_id}, f)
+            lists = self._assign(vectors) if self.trained else np.full(len(ids), -1, dtype=np.int32)
+
+            with open(self._vectors_file, "ab") as f:
+                vectors.astype(np.float16).tofile(f)
+            with open(self._lists_file, "ab") as f:
+                lists.tofile(f)
+            # ids last: their count is what decides how many rows are valid
+            with open(self._ids_file, "ab") as f:
+                ids.tofile(f)
+
+            self.ids = np.concatenate([self.ids, ids])
+            self.lists = np.concatenate([self.lists, lists])
+            self._map_vectors()
+            return len(ids)
+
+    def _assign(self, vectors, centroids=None, chunk_size=8192):
+        centroids = self.centroids if centroids is None else centroids
+        out = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), chunk_size):
+            block = np.asarray(vectors[start:start + chunk_size], dtype=np.float32)
+            out[start:start + chunk_size] = (block @ centroids.T).argmax(axis=1)
+        return out
+
+    def train(self, n_lists=None, iterations=10, sample_size=50000, seed=0):
+        """Spherical k-means over a sample, then re-assign every stored row."""
+        with self._lock:
+            if not len(self.ids):
+                return
+            n_lists = n_lists or max(1, int(np.sqrt(len(self.ids))))
+            rng = np.random.default_rng(seed)
+            sample_rows = np.sort(rng.choice(len(self.ids), size=min(sample_size, len(self.ids)), replace=False))
+            sample = np.asarray(self.vectors[sample_rows], dtype=np.float32)
+            n_lists = min(n_lists, len(sample))
+
+            centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+            for _ in range(iterations):
+                labels = (sample @ centroids.T).argmax(axis=1)
+                for c in range(n_lists):
+                    members = sample[labels == c]
+                    if len(members):
+                        centroids[c] = members.sum(axis=0)
+                centroids = normalize_rows(centroids)
+
+            lists = self._assign(self.vectors, centroids)
+            # replaced atomically: a half-written lists file would make _load
+            # truncate ids and vectors to match it
+            self._replace_file(self._lists_file, lists.tofile)
+            self._replace_file(self._centroids_file, lambda f: np.save(f, centroids))
+            self.centroids = centroids
+            self.lists = lists
+            self._list_rows = None
+
+    @staticmethod
+    def _replace_file(path, write):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+
+    def _rows_by_list(self):
+        # rows grouped by inverted list: order[offsets[c]:offsets[c + 1]] are list c's rows
+        if self._list_rows is None:
+            order = np.argsort(self.lists, kind="stable")
+            offsets = np.searchsorted(self.lists[order], np.arange(len(self.centroids) + 1))
+            self._list_rows = (order, offsets)
+        return self._list_rows
+
+    def search(self, query, k=10, n_probe=8):
+        """Return [(id, cosine score)] for the k nearest stored vectors."""
+        query = normalize_rows(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+        with self._lock:
+            if not len(self.ids):
+                return []
+            if not self.trained or n_probe >= len(self.centroids):
+                return self._top_k(np.arange(len(self.ids)), query, k)
+
+            order, offsets = self._rows_by_list()
+            probe = np.argsort(-(self.centroids @ query))[:n_probe]
+            rows = np.concatenate([order[offsets[c]:offsets[c + 1]] for c in probe])
+            return self._top_k(np.sort(rows), query, k)
+
+    def brute_force_search(self, query, k=10):
+        query = normalize_rows(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+        with self._lock:
+            if not len(self.ids):
+                return []
+            return self._top_k(np.arange(len(self.ids)), query, k)
+
+    def _top_k(self, rows, query, k, chunk_size=65536):
+        scores = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), chunk_size):
+            block = np.asarray(self.vectors[rows[start:start + chunk_size]], dtype=np.float32)
+            scores[start:start + chunk_size] = block @ query
+        k = min(k, len(rows))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(int(self.ids[rows[i]]), float(scores[i])) for i in best]
+
+
+def embed_resume_text(index, resume_id, text, progress=None):
+    # job-queue entry point: embed off the page thread, then append to the index
+    from .nlp_processor import NLPProcessor
+    processor = NLPProcessor()
+    try:
+        index.check_model(processor.embedding_model_name)
+        vectors = processor.get_document_embeddings([text])
+    finally:
+        processor.close()
+    index.add([resume_id], vectors)
+    return resume_id
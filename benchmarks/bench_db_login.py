@@ -0,0 +1,94 @@
+# benchmarks/bench_db_login.py
+# Concurrent login throughput: pooled WAL Database vs a connection per call.
+# Run from the repo root: python -m benchmarks.bench_db_login
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.database import Database, DEFAULT_USERS
+
+
+def legacy_create_tables(db_name):
+    conn = sqlite3.connect(db_name)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.executemany("INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)", DEFAULT_USERS)
+    conn.commit()
+    conn.close()
+
+
+def legacy_get_user(db_name, username):
+    # what every Database.get_user call used to do
+    conn = sqlite3.connect(db_name)
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
+    user = cursor.fetchone()
+    conn.close()
+    return user
+
+
+def legacy_add_user(db_name, username, password):
+    try:
+        conn = sqlite3.connect(db_name)
+        conn.execute("INSERT INTO users (username, password) VALUES (?, ?)", (username, password))
+        conn.commit()
+        conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def run(label, login, signup, threads, logins, signup_every):
+    usernames = [name for name, _ in DEFAULT_USERS]
+    errors = 0
+
+    def worker(worker_id):
+        nonlocal errors
+        for i in range(logins):
+            if signup_every and i % signup_every == 0:
+                if not signup(f"{label}_{worker_id}_{i}", "secret123"):
+                    errors += 1
+            if login(usernames[i % len(usernames)]) is None:
+                errors += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(worker, range(threads)))
+    elapsed = time.perf_counter() - start
+    total = threads * logins
+    print(f"{label:>8}: {total / elapsed:>10.0f} logins/s  ({elapsed:.2f}s, {errors} errors)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent logins")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--logins", type=int, default=500, help="logins per thread")
+    parser.add_argument("--signup-every", type=int, default=25, help="one signup per N logins (0 = none)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = os.path.join(tmp, "legacy.db")
+        pooled_db = os.path.join(tmp, "pooled.db")
+        # same schema and seed data for both runs
+        legacy_create_tables(legacy_db)
+        db = Database(pooled_db)
+
+        run("legacy", lambda u: legacy_get_user(legacy_db, u),
+            lambda u, p: legacy_add_user(legacy_db, u, p),
+            args.threads, args.logins, args.signup_every)
+        run("pooled", db.get_user, db.add_user,
+            args.threads, args.logins, args.signup_every)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# benchmarks/bench_embedding_backends.py
+# Parity and speed of the embedding backends on the real MiniLM weights.
+#
+#   python -m backend.embedding_backends                # export the int8 ONNX model once
+#   python -m benchmarks.bench_embedding_backends --threads 1,4 --batch-sizes 16,64
+#
+# Parity: every resume/job pair is matched with each backend and the 0.7/0.3
+# tier of every job skill is compared against the torch baseline, and each
+# skill's embedding is compared by cosine. The run exits non-zero when a
+# backend falls below --min-tier-agreement or --min-cosine.
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ["SKILL_ANALYZER_CACHE_DIR"] = tempfile.mkdtemp(prefix="skill_bench_")
+
+from backend.embedding_backends import BACKENDS, load_embedding_backend
+from backend.embedding_cache import normalize_rows
+from backend.model_registry import ModelRegistry
+from backend.nlp_processor import NLPProcessor
+from backend.skill_analyzer import SkillAnalyzer
+from benchmarks.corpus import generate_corpus
+from benchmarks.stub_models import load_stub_spacy
+
+
+def make_analyzer(backend):
+    models = ModelRegistry()
+    models.register("spacy", load_stub_spacy)
+    models.register("embedding", lambda: backend)
+    return SkillAnalyzer(NLPProcessor(model_registry=models))
+
+
+def tiers(skill_analysis):
+    out = {skill["job_skill"]: "high" for skill in skill_analysis["matched_skills"]}
+    out.update({skill["job_skill"]: "partial" for skill in skill_analysis["partial_matches"]})
+    out.update({skill["skill"]: "missing" for skill in skill_analysis["missing_skills"]})
+    return out
+
+
+def cosine_parity(baseline, candidate, skills):
+    # row-wise cosine between the two backends' embeddings of the same skills
+    expected = normalize_rows(baseline.nlp.embedding_model.encode(skills))
+    actual = normalize_rows(candidate.nlp.embedding_model.encode(skills))
+    cosines = (expected * actual).sum(axis=1)
+    return float(cosines.min()), float(cosines.mean())
+
+
+def parity(baseline, candidate, pairs):
+    agree = total = identical_pairs = 0
+    max_gap = 0.0
+    for resume_skills, job_skills in pairs:
+        expected = baseline._match_skills(resume_skills, job_skills)
+        actual = candidate._match_skills(resume_skills, job_skills)
+        expected_tiers, actual_tiers = tiers(expected), tiers(actual)
+        same = sum(expected_tiers[skill] == actual_tiers[skill] for skill in expected_tiers)
+        agree += same
+        total += len(expected_tiers)
+        identical_pairs += same == len(expected_tiers)
+        max_gap = max(max_gap, abs(expected["overall_match"] - actual["overall_match"]))
+    return {
+        "tier_agreement": agree / total if total else 1.0,
+        "identical_pairs": identical_pairs / len(pairs) if pairs else 1.0,
+        "max_overall_match_gap": max_gap,
+    }
+
+
+def throughput(backend, texts, batch_size, repeat):
+    backend.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for i in range(0, len(texts), batch_size):
+            t0 = time.perf_counter()
+            backend.encode(texts[i:i + batch_size], batch_size=batch_size)
+            latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - start
+    return statistics.median(latencies) * 1000, len(texts) * repeat / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare embedding backends for parity and speed")
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--threads", default="1,4")
+    parser.add_argument("--batch-sizes", default="16,64")
+    parser.add_argument("--resumes", type=int, default=40)
+    parser.add_argument("--jobs", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    # the tiers should come out the same; int8 rounding may move a skill sitting on a 0.7/0.3 edge
+    parser.add_argument("--min-tier-agreement", type=float, default=0.99)
+    parser.add_argument("--min-cosine", type=float, default=0.98, help="lowest per-skill cosine to the baseline")
+    args = parser.parse_args()
+    names = args.backends.split(",")
+
+    loaded, load_seconds = {}, {}
+    for name in names:
+        start = time.perf_counter()
+        loaded[name] = load_embedding_backend(name)
+        load_seconds[name] = time.perf_counter() - start
+    analyzers = {name: make_analyzer(backend) for name, backend in loaded.items()}
+
+    baseline = analyzers[names[0]]
+    corpus = generate_corpus(baseline.nlp.skill_keywords, n_resumes=args.resumes, n_jobs=args.jobs,
+                             seed=args.seed)
+    resume_skills = [baseline.nlp.extract_skills(text) for text in corpus["resumes"]]
+    job_skills = [baseline.nlp.extract_skills(text) for text in corpus["jobs"]]
+    # unseen phrasings take the encode path instead of the vocabulary matrix
+    resume_skills = [skills + ["cloud infrastructure automation", "customer facing analytics"]
+                     for skills in resume_skills]
+    pairs = [(r, j) for r in resume_skills for j in job_skills]
+
+    skills = sorted({skill for skills in resume_skills + job_skills for skill in skills})
+    failures = []
+    print(f"{'backend':<8} {'load s':>7} {'tier agreement':>15} {'identical pairs':>16} {'max score gap':>14} "
+          f"{'min cosine':>11} {'mean cosine':>12}")
+    for name in names:
+        result = parity(baseline, analyzers[name], pairs)
+        min_cosine, mean_cosine = cosine_parity(baseline, analyzers[name], skills)
+        print(f"{name:<8} {load_seconds[name]:>7.2f} {result['tier_agreement']:>15.2%} "
+              f"{result['identical_pairs']:>16.2%} {result['max_overall_match_gap']:>14.2f} "
+              f"{min_cosine:>11.4f} {mean_cosine:>12.4f}")
+        if result["tier_agreement"] < args.min_tier_agreement:
+            failures.append(f"{name}: tier agreement {result['tier_agreement']:.2%} < {args.min_tier_agreement:.2%}")
+        if min_cosine < args.min_cosine:
+            failures.append(f"{name}: min cosine {min_cosine:.4f} < {args.min_cosine}")
+
+    # throughput on resume-sized chunks, the get_document_embeddings workload
+    chunk_words = NLPProcessor.DOCUMENT_CHUNK_WORDS
+    texts = [" ".join(text.split()[:chunk_words]) for text in corpus["resumes"]]
+    print(f"\n{'backend':<8} {'threads':>7} {'batch':>6} {'p50 batch ms':>13} {'texts/s':>9}")
+    for threads in (int(t) for t in args.threads.split(",")):
+        for name in names:
+            # thread pools are fixed at load time, so each setting gets a fresh backend
+            backend = load_embedding_backend(name, threads=threads)
+            for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+                p50_ms, rate = throughput(backend, texts, batch_size, args.repeat)
+                print(f"{name:<8} {threads:>7} {batch_size:>6} {p50_ms:>13.1f} {rate:>9.1f}")
+
+    if failures:
+        print("\n❌ Parity check failed:\n  " + "\n  ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
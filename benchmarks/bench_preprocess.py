@@ -0,0 +1,53 @@
+# benchmarks/bench_preprocess.py
+# Micro-benchmark: compiled preprocess_text vs the previous two re.sub version.
+# Run from the repo root: python -m benchmarks.bench_preprocess
+
+import argparse
+import random
+import re
+import timeit
+
+from backend.document_processor import DocumentProcessor
+
+SAMPLE_WORDS = [
+    "python", "c++", "c#", "ci/cd", "pl/sql", "t-sql", "kubernetes", "led", "team",
+    "of", "engineers", "(2019-2023)", "•", "built", "REST", "APIs", "—", "e-mail:",
+    "john@example.com", "10+", "years", "node.js", "AWS,", "Docker;", "→", "agile.",
+]
+
+
+def legacy_preprocess_text(text: str) -> str:
+    if not text:
+        return ""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s.,!?;:]', '', text)
+    return text.strip()
+
+
+def make_text(n_words, seed=0):
+    rng = random.Random(seed)
+    separators = [" ", " ", " ", "  ", "\n", "\n\n", "\t"]
+    return "".join(rng.choice(SAMPLE_WORDS) + rng.choice(separators) for _ in range(n_words))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark preprocess_text")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'words':>10} {'chars':>10} {'legacy ms':>10} {'compiled ms':>12} {'speedup':>8}")
+    for n_words in args.sizes:
+        text = make_text(n_words)
+        number = max(1, 200_000 // n_words)
+        legacy = min(timeit.repeat(lambda: legacy_preprocess_text(text), number=number, repeat=args.repeat)) / number
+        compiled = min(timeit.repeat(lambda: DocumentProcessor.preprocess_text(text), number=number, repeat=args.repeat)) / number
+        print(f"{n_words:>10} {len(text):>10} {legacy * 1000:>10.2f} {compiled * 1000:>12.2f} {legacy / compiled:>7.2f}x")
+
+    # the skill-significant characters must survive normalization
+    kept = DocumentProcessor.preprocess_text("C++, C#, CI/CD and PL/SQL, T-SQL")
+    print(f"\nkept symbols: {kept!r}")
+
+
+if __name__ == "__main__":
+    main()
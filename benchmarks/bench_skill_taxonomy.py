@@ -0,0 +1,102 @@
+# benchmarks/bench_skill_taxonomy.py
+# Compile time and per-document extraction latency of the skill taxonomy as it
+# grows, with the bundled skills padded by synthetic ones to each size.
+# Run from the repo root: python -m benchmarks.bench_skill_taxonomy --sizes 1000,10000,100000
+#
+# The documents are the same at every size, so flat latencies mean scan cost
+# doesn't depend on the number of terms. --compare-trie also times the
+# character-level Aho-Corasick SkillMatcher on the same surface forms and
+# checks that both find the same skills.
+
+import argparse
+import json
+import os
+import random
+import statistics
+import string
+import tempfile
+import time
+
+from backend.skill_matcher import SkillMatcher
+from backend.skill_taxonomy import DEFAULT_TAXONOMY_PATH, load_taxonomy, read_taxonomy_entries
+from benchmarks.corpus import FILLER_WORDS, generate_corpus
+
+
+def synthetic_entries(base_entries, size, seed):
+    """base_entries padded with made-up skills (and some aliases) up to size ids."""
+    rng = random.Random(seed)
+    taken = {entry["id"] for entry in base_entries}
+    # real words as first tokens, so synthetic phrases share prefixes with the text
+    heads = sorted({entry["id"].split()[0] for entry in base_entries} | set(FILLER_WORDS))
+    entries = list(base_entries)
+    while len(entries) < size:
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+                 for _ in range(rng.randint(1, 3))]
+        if rng.random() < 0.3:
+            words.insert(0, rng.choice(heads))
+        skill_id = " ".join(words)
+        if skill_id in taken:
+            continue
+        taken.add(skill_id)
+        entry = {"id": skill_id, "category": "Synthetic"}
+        if rng.random() < 0.2:
+            entry["aliases"] = ["".join(word[0] for word in words) + str(len(entries))]
+        entries.append(entry)
+    return entries
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def scan_latencies(find, documents, repeat):
+    latencies = []
+    for _ in range(repeat):
+        for text in documents:
+            latencies.append(timed(lambda: find(text))[1])
+    latencies.sort()
+    return statistics.fmean(latencies), latencies[int(len(latencies) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skill extraction against taxonomy size")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--documents", type=int, default=50)
+    parser.add_argument("--words", type=int, default=600)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--compare-trie", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    base_entries = read_taxonomy_entries(DEFAULT_TAXONOMY_PATH)
+    surfaces = [entry["id"] for entry in base_entries]
+    surfaces += [alias for entry in base_entries for alias in entry.get("aliases", ())]
+    documents = [text.lower() for text in generate_corpus(
+        surfaces, n_resumes=args.documents, n_jobs=0, resume_words=args.words, seed=args.seed)["resumes"]]
+
+    workdir = tempfile.mkdtemp(prefix="skill_bench_taxonomy_")
+    print(f"{'terms':>7} {'surfaces':>9} {'compile ms':>11} {'mean ms':>8} {'p95 ms':>8}"
+          + (f" {'trie compile ms':>16} {'trie mean ms':>13} {'same skills':>12}" if args.compare_trie else ""))
+    for size in (int(s) for s in args.sizes.split(",")):
+        path = os.path.join(workdir, f"taxonomy_{size}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "skills": synthetic_entries(base_entries, size, args.seed)}, f)
+
+        taxonomy, compile_ms = timed(lambda: load_taxonomy(path))
+        mean_ms, p95_ms = scan_latencies(taxonomy.find_skills, documents, args.repeat)
+        line = (f"{len(taxonomy):>7} {len(taxonomy.surface_forms):>9} {compile_ms:>11.0f} "
+                f"{mean_ms:>8.3f} {p95_ms:>8.3f}")
+
+        if args.compare_trie:
+            trie, trie_compile_ms = timed(lambda: SkillMatcher(taxonomy.surface_forms))
+            trie_find = lambda text: {taxonomy.surface_forms[k] for k in trie.find_keywords(text)}
+            trie_mean_ms, _ = scan_latencies(trie_find, documents, args.repeat)
+            same = sum(taxonomy.find_skills(text) == trie_find(text) for text in documents) / len(documents)
+            line += f" {trie_compile_ms:>16.0f} {trie_mean_ms:>13.3f} {same:>12.0%}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
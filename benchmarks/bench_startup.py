@@ -0,0 +1,63 @@
+# benchmarks/bench_startup.py
+# Cold import time of each entry point's dependencies, in fresh interpreters.
+# Run from the repo root: python -m benchmarks.bench_startup
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# what each page imports before it can render anything
+ENTRY_POINTS = {
+    "Home.py (login)": ["streamlit", "auth", "helpers"],
+    "1_Upload_Documents.py": ["streamlit", "helpers", "backend.document_processor"],
+    "2_Skill_Analysis_and_Report.py": [
+        "streamlit", "helpers", "backend.report_generator", "backend.calculations", "backend.job_queue"
+    ],
+    "analysis models (first run)": ["backend.skill_analyzer", "backend.nlp_processor"],
+}
+
+HEAVY_MODULES = ["reportlab", "plotly", "pandas", "spacy", "sentence_transformers", "torch",
+                 "sklearn", "PyPDF2", "docx2txt", "numpy"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def probe(modules):
+    code = PROBE.format(modules=modules, heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1]
+    return json.loads(result.stdout.strip().splitlines()[-1]), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark time-to-first-render imports")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'entry point':<34} {'median s':>9} {'min s':>7}  heavy modules loaded")
+    for label, modules in ENTRY_POINTS.items():
+        timings, heavy, error = [], [], None
+        for _ in range(args.repeat):
+            result, error = probe(modules)
+            if result is None:
+                break
+            timings.append(result["seconds"])
+            heavy = result["heavy"]
+        if not timings:
+            print(f"{label:<34} failed: {error}")
+            continue
+        print(f"{label:<34} {statistics.median(timings):>9.3f} {min(timings):>7.3f}  {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
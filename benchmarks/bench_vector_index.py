@@ -0,0 +1,97 @@
+# benchmarks/bench_vector_index.py
+# Recall and latency of the IVF resume index against an exact cosine scan,
+# plus the end-to-end saving of shortlisting before skill matching.
+# Run from the repo root: python -m benchmarks.bench_vector_index --resumes 20000
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ["SKILL_ANALYZER_CACHE_DIR"] = tempfile.mkdtemp(prefix="skill_bench_")
+
+from backend.model_registry import registry
+from backend.nlp_processor import NLPProcessor
+from backend.skill_analyzer import SkillAnalyzer
+from backend.vector_index import VectorIndex
+from benchmarks.corpus import generate_document
+from benchmarks.stub_models import install_stub_models
+
+
+def topic_corpus(vocabulary, n_docs, n_words, skill_density, n_topics, seed):
+    # resumes cluster by specialty, so each document draws skills from one topic
+    rng = random.Random(seed)
+    vocabulary = sorted(vocabulary)
+    rng.shuffle(vocabulary)
+    topics = [vocabulary[i::n_topics] for i in range(n_topics)]
+    return [generate_document(rng, rng.choice(topics), n_words, skill_density) for _ in range(n_docs)]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark approximate resume search")
+    parser.add_argument("--resumes", type=int, default=5000)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--resume-words", type=int, default=400)
+    parser.add_argument("--job-words", type=int, default=150)
+    parser.add_argument("--skill-density", type=float, default=0.15)
+    parser.add_argument("--topics", type=int, default=20)
+    parser.add_argument("--lists", type=int, default=None, help="IVF lists (default sqrt(resumes))")
+    parser.add_argument("--probes", default="1,4,8,16")
+    parser.add_argument("--k", type=int, default=100, help="shortlist size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    install_stub_models(registry)
+    nlp = NLPProcessor()
+    analyzer = SkillAnalyzer(nlp)
+    resumes = topic_corpus(nlp.skill_keywords, args.resumes, args.resume_words, args.skill_density,
+                           args.topics, args.seed)
+    jobs = topic_corpus(nlp.skill_keywords, args.jobs, args.job_words, args.skill_density * 1.5,
+                        args.topics, args.seed + 1)
+
+    index = VectorIndex(tempfile.mkdtemp(prefix="skill_bench_vectors_"))
+    batches = [range(start, min(start + 512, len(resumes))) for start in range(0, len(resumes), 512)]
+    _, embed_ms = timed(lambda: [
+        index.add(ids, nlp.get_document_embeddings(resumes[ids.start:ids.stop])) for ids in batches
+    ])
+    _, train_ms = timed(lambda: index.train(n_lists=args.lists))
+    print(f"indexed {len(index)} resumes in {embed_ms / 1000:.1f}s, "
+          f"{len(index.centroids)} lists trained in {train_ms:.0f}ms")
+
+    queries = nlp.get_document_embeddings(jobs)
+    exact, exact_ms = [], []
+    for query in queries:
+        hits, ms = timed(lambda: index.brute_force_search(query, k=args.k))
+        exact.append({resume_id for resume_id, _ in hits})
+        exact_ms.append(ms)
+
+    print(f"\n{'search':<14} {'recall@k':>9} {'p50 ms':>8} {'max ms':>8}")
+    print(f"{'exact':<14} {1.0:>9.3f} {statistics.median(exact_ms):>8.2f} {max(exact_ms):>8.2f}")
+    for n_probe in (int(p) for p in args.probes.split(",")):
+        recalls, latencies = [], []
+        for query, truth in zip(queries, exact):
+            hits, ms = timed(lambda: index.search(query, k=args.k, n_probe=n_probe))
+            recalls.append(len(truth & {resume_id for resume_id, _ in hits}) / len(truth))
+            latencies.append(ms)
+        print(f"{f'ivf n_probe={n_probe}':<14} {statistics.fmean(recalls):>9.3f} "
+              f"{statistics.median(latencies):>8.2f} {max(latencies):>8.2f}")
+
+    # end to end for one job: skill-match every resume vs only the shortlist
+    lookup = lambda ids: {resume_id: resumes[resume_id] for resume_id in ids}
+    _, full_ms = timed(lambda: analyzer.analyze_batch(resumes, jobs[0], top_k=10))
+    _, shortlist_ms = timed(lambda: analyzer.shortlist_and_analyze(jobs[0], index, lookup, shortlist_size=args.k,
+                                                                    top_k=10))
+    print(f"\nanalyze_batch over all resumes: {full_ms:.0f}ms, "
+          f"shortlist_and_analyze (k={args.k}): {shortlist_ms:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# benchmarks/corpus.py
+# Synthetic resumes and job descriptions built from the skill vocabulary.
+
+import random
+
+FILLER_WORDS = [
+    "experienced", "worked", "with", "team", "delivered", "projects", "using", "the", "and",
+    "responsible", "for", "designing", "building", "maintaining", "systems", "across",
+    "multiple", "clients", "improved", "performance", "by", "percent", "led", "migration",
+    "of", "legacy", "services", "to", "in", "a", "fast", "paced", "environment", "strong",
+    "background", "knowledge", "hands", "on", "years", "role", "requirements", "candidate",
+    "will", "be", "required", "preferred", "plus", "ownership", "collaborated", "stakeholders",
+]
+
+# noise that preprocess_text has to strip or keep
+PUNCTUATION = [",", ".", ";", " -", " (2019-2023)", " •", " @", ":", "!"]
+
+
+def generate_document(rng, vocabulary, n_words, skill_density):
+    """A text of roughly n_words words where skill_density of them are skill phrases."""
+    words = []
+    while len(words) < n_words:
+        if rng.random() < skill_density:
+            words.extend(rng.choice(vocabulary).split())
+        else:
+            words.append(rng.choice(FILLER_WORDS))
+        if rng.random() < 0.08:
+            words[-1] += rng.choice(PUNCTUATION)
+        if rng.random() < 0.03:
+            words[-1] += "\n"
+    return " ".join(words)
+
+
+def generate_corpus(vocabulary, n_resumes=50, n_jobs=5, resume_words=600, job_words=250,
+                    skill_density=0.1, seed=0):
+    rng = random.Random(seed)
+    vocabulary = sorted(vocabulary)
+    return {
+        "resumes": [generate_document(rng, vocabulary, resume_words, skill_density) for _ in range(n_resumes)],
+        "jobs": [generate_document(rng, vocabulary, job_words, skill_density * 1.5) for _ in range(n_jobs)],
+    }
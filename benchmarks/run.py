@@ -0,0 +1,211 @@
+# benchmarks/run.py
+# Per-stage timings and memory peaks for the analysis pipeline on a synthetic corpus.
+#
+#   python -m benchmarks.run --output bench.json
+#   python -m benchmarks.run --output new.json --compare bench.json
+#
+# Runs offline on CPU: the embedding model is a stub and spaCy is a blank pipeline.
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# keep the stub vocabulary matrix out of the real embedding cache
+os.environ["SKILL_ANALYZER_CACHE_DIR"] = tempfile.mkdtemp(prefix="skill_bench_")
+
+from backend.document_processor import DocumentProcessor
+from backend.model_registry import registry
+from backend.nlp_processor import NLPProcessor
+from backend.report_generator import ReportGenerator, write_reports_zip
+from backend.skill_analyzer import SkillAnalyzer
+from backend.skill_result import json_default
+from benchmarks.corpus import generate_corpus
+from benchmarks.stub_models import install_stub_models
+
+
+def measure(fn, items, repeat=1):
+    """Time fn over every item, then re-run once under tracemalloc for the peak.
+
+    Returns None when there is nothing to time, and the stage is reported as n/a.
+    """
+    if not items:
+        return None
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            t0 = time.perf_counter()
+            fn(item)
+            latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - start
+
+    tracemalloc.start()
+    for item in items:
+        fn(item)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "items": len(items) * repeat,
+        "total_s": total,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        "items_per_s": len(latencies) / total if total else 0.0,
+        "peak_mem_mib": peak / 2**20,
+    }
+
+
+def make_pdf(text):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+    buffer = io.BytesIO()
+    styles = getSampleStyleSheet()
+    chunks = [text[i:i + 2000] for i in range(0, len(text), 2000)]
+    SimpleDocTemplate(buffer, pagesize=A4).build(
+        [Paragraph(chunk.replace("\n", " ").replace("&", "&amp;").replace("<", "&lt;"), styles["Normal"])
+         for chunk in chunks]
+    )
+    return buffer.getvalue()
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(args):
+    install_stub_models(registry)
+    nlp = NLPProcessor()
+    analyzer = SkillAnalyzer(nlp)
+    processor = DocumentProcessor()
+    reports = ReportGenerator()
+
+    corpus = generate_corpus(
+        nlp.skill_keywords, n_resumes=args.resumes, n_jobs=args.jobs, resume_words=args.resume_words,
+        job_words=args.job_words, skill_density=args.skill_density, seed=args.seed
+    )
+    resumes, jobs = corpus["resumes"], corpus["jobs"]
+    try:
+        import PyPDF2  # noqa: F401
+        pdfs = [make_pdf(text) for text in resumes[:args.pdfs]]
+    except ImportError:
+        print("PyPDF2 is not installed, skipping PDF extraction", file=sys.stderr)
+        pdfs = []
+
+    texts = [processor.preprocess_text(text) for text in resumes]
+    job_texts = [processor.preprocess_text(text) for text in jobs]
+    resume_skills = [nlp.extract_skills(text) for text in texts]
+    job_skills = [nlp.extract_skills(text) for text in job_texts]
+    pairs = [(r, j) for r in resume_skills for j in job_skills][:args.pairs]
+    # warm the vocabulary matrix so it isn't charged to the first stage that needs it
+    nlp.get_skill_embeddings(sorted(nlp.skill_keywords)[:1])
+    analyses = [analyzer.analyze_skill_gap(texts[i % len(texts)], job_texts[i % len(job_texts)])
+                for i in range(min(args.reports, len(texts)))]
+    # a candidate's second run: one sentence rewritten, same job description
+    edits = [(texts[i] + " Recently moved our deployments to kubernetes.", job_texts[i % len(job_texts)])
+             for i in range(len(analyses))]
+
+    stages = {
+        "document.extract_text_from_pdf": measure(
+            lambda data: processor.extract_text_from_pdf(io.BytesIO(data)), pdfs),
+        "document.preprocess_text": measure(processor.preprocess_text, resumes, args.repeat),
+        "nlp.extract_skills": measure(nlp.extract_skills, texts, args.repeat),
+        "nlp.extract_skills_batch": measure(nlp.extract_skills_batch, [texts]),
+        "nlp.get_embeddings": measure(nlp.get_embeddings, resume_skills),
+        "nlp.get_skill_embeddings": measure(nlp.get_skill_embeddings, resume_skills, args.repeat),
+        "analyzer._match_skills": measure(lambda pair: analyzer._match_skills(*pair), pairs, args.repeat),
+        "analyzer.analyze_batch": measure(lambda job: analyzer.analyze_batch(texts, job), job_texts),
+        "analyzer.reanalyze_edited_resume": measure(lambda pair: analyzer.analyze_skill_gap(*pair), edits),
+        "report.generate_pdf_report": measure(reports.generate_pdf_report, analyses),
+        "report.write_reports_zip": measure(lambda batch: write_reports_zip(batch, io.BytesIO()), [analyses]),
+        "result.to_bytes": measure(lambda analysis: analysis["skill_analysis"].to_bytes(), analyses, args.repeat),
+        "result.json": measure(lambda analysis: json.dumps(analysis, default=json_default), analyses, args.repeat),
+    }
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "params": vars(args) | {"output": None, "compare": None},
+            "avg_resume_skills": statistics.fmean(len(skills) for skills in resume_skills),
+            "avg_job_skills": statistics.fmean(len(skills) for skills in job_skills),
+        },
+        "stages": stages,
+    }
+
+
+def compare(current, baseline, threshold):
+    print(f"\n{'stage':<34} {'baseline ms':>12} {'current ms':>11} {'change':>8}")
+    regressions = []
+    for name, stage in current["stages"].items():
+        old = baseline["stages"].get(name)
+        if stage is None:
+            print(f"{name:<34} {'-' if old is None else format(old['mean_ms'], '.3f'):>12} {'n/a':>11}")
+            continue
+        if old is None:
+            print(f"{name:<34} {'-':>12} {stage['mean_ms']:>11.3f}")
+            continue
+        change = stage["mean_ms"] / old["mean_ms"] - 1 if old["mean_ms"] else 0.0
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{name:<34} {old['mean_ms']:>12.3f} {stage['mean_ms']:>11.3f} {change:>+7.0%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every pipeline stage on a synthetic corpus")
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--jobs", type=int, default=5)
+    parser.add_argument("--resume-words", type=int, default=600)
+    parser.add_argument("--job-words", type=int, default=250)
+    parser.add_argument("--skill-density", type=float, default=0.1)
+    parser.add_argument("--pdfs", type=int, default=10, help="resumes also rendered to PDF for extraction")
+    parser.add_argument("--pairs", type=int, default=200, help="resume/job pairs for _match_skills")
+    parser.add_argument("--reports", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown flagged as a regression")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args)
+    print(f"{'stage':<34} {'items':>6} {'mean ms':>9} {'p95 ms':>9} {'items/s':>10} {'peak MiB':>9}")
+    for name, stage in results["stages"].items():
+        if stage is None:
+            print(f"{name:<34} {0:>6} {'n/a':>9}")
+            continue
+        print(f"{name:<34} {stage['items']:>6} {stage['mean_ms']:>9.3f} {stage['p95_ms']:>9.3f} "
+              f"{stage['items_per_s']:>10.1f} {stage['peak_mem_mib']:>9.2f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
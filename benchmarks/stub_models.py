@@ -0,0 +1,91 @@
+# benchmarks/stub_models.py
+# Offline stand-ins for the downloaded models, so benchmarks run on any CPU box.
+
+import hashlib
+import re
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"\S+")
+
+
+class StubEmbeddingModel:
+    """Deterministic bag-of-tokens embeddings with the MiniLM output shape.
+
+    Each token maps to a fixed random vector, so phrases that share words
+    ("spring" / "spring boot") come out similar, like a real model would.
+    """
+
+    def __init__(self, dim=384):
+        self.dim = dim
+        self._token_vectors = {}
+
+    def _token_vector(self, token):
+        vector = self._token_vectors.get(token)
+        if vector is None:
+            seed = int.from_bytes(hashlib.sha256(token.encode("utf-8")).digest()[:8], "little")
+            vector = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+            self._token_vectors[token] = vector
+        return vector
+
+    def encode(self, texts, convert_to_numpy=True, normalize_embeddings=False, batch_size=32, **kwargs):
+        if isinstance(texts, str):
+            texts = [texts]
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for token in text.lower().split():
+                out[i] += self._token_vector(token)
+        if normalize_embeddings:
+            norms = np.linalg.norm(out, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            out /= norms
+        return out
+
+
+class _StubDoc(list):
+    pass
+
+
+class _StubToken:
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+
+class StubTokenizer:
+    def __call__(self, text):
+        return _StubDoc(_StubToken(match.group()) for match in _TOKEN_RE.finditer(text))
+
+    def pipe(self, texts, batch_size=64):
+        for text in texts:
+            yield self(text)
+
+
+class StubNLP:
+    """Whitespace tokenizer with the bits of the spaCy Language API the app uses."""
+
+    pipe_names = []
+
+    def __init__(self):
+        self.tokenizer = StubTokenizer()
+
+    def __call__(self, text, disable=()):
+        return self.tokenizer(text)
+
+    def pipe(self, texts, batch_size=64, n_process=1, disable=()):
+        return self.tokenizer.pipe(texts, batch_size=batch_size)
+
+
+def load_stub_spacy():
+    # a blank spaCy pipeline is offline; fall back when spaCy isn't installed
+    try:
+        import spacy
+        return spacy.blank("en")
+    except ImportError:
+        return StubNLP()
+
+
+def install_stub_models(registry):
+    registry.register("embedding", StubEmbeddingModel)
+    registry.register("spacy", load_stub_spacy)
@@ -0,0 +1,200 @@
+# cli.py
+# Headless bulk scoring: rank a directory of resumes against one job description.
+#
+#   python cli.py --job-desc jd.txt --resumes resumes/ --output ranked.jsonl
+#
+# Results are streamed to a checkpoint file as they complete, so an
+# interrupted run picks up where it stopped when started again. The checkpoint
+# is only reused for the same job description, model and skill taxonomy.
+
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from backend.calculations import Calculations
+from backend.document_processor import DocumentProcessor
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+# per-worker state, filled in by _init_worker
+_worker = {}
+
+
+def find_resumes(directory):
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def _init_worker(job_desc_text):
+    # each worker process loads its own models once, then scores many files
+    from backend.skill_analyzer import SkillAnalyzer
+    DocumentProcessor.PDF_WORKERS = 1  # no nested process pools inside a worker
+    _worker["processor"] = DocumentProcessor()
+    _worker["analyzer"] = SkillAnalyzer()
+    _worker["job_desc_text"] = job_desc_text
+
+
+def _score_file(path):
+    start = time.perf_counter()
+    record = {"path": path}
+    document = _worker["processor"].process_file(path)
+    if not document["success"]:
+        record["error"] = document["error"]
+    else:
+        try:
+            analysis = _worker["analyzer"].analyze_skill_gap(document["text"], _worker["job_desc_text"])
+            skill_analysis = analysis["skill_analysis"]
+            record.update({
+                "compatibility_score": analysis["compatibility_score"],
+                "skill_gap": Calculations.calculate_skill_gap(skill_analysis),
+                "high_match_count": skill_analysis["high_match_count"],
+                "partial_match_count": skill_analysis["partial_match_count"],
+                "missing_count": skill_analysis["missing_count"],
+                "matched_skills": [skill["job_skill"] for skill in skill_analysis["matched_skills"]],
+                "partial_matches": [skill["job_skill"] for skill in skill_analysis["partial_matches"]],
+                "missing_skills": [skill["skill"] for skill in skill_analysis["missing_skills"]]
+            })
+        except Exception as e:
+            record["error"] = str(e)
+    record["latency_s"] = time.perf_counter() - start
+    return record
+
+
+def run_fingerprint(job_desc_text):
+    # everything a score depends on besides the resume itself
+    from backend.embedding_backends import configured_model_id
+    from backend.skill_taxonomy import load_taxonomy
+    return {
+        "job_desc": hashlib.sha256(job_desc_text.encode("utf-8")).hexdigest(),
+        "model": configured_model_id(),
+        "vocabulary": load_taxonomy().hash,
+    }
+
+
+def load_checkpoint(path):
+    """(header, records by path) from a checkpoint file; header is None for a missing or headerless file.
+
+    Failed records are left out so their files are retried.
+    """
+    header, records = None, {}
+    if not os.path.exists(path):
+        return header, records
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by an interrupted run
+            if "checkpoint" in record:
+                header = record["checkpoint"]
+            elif "error" not in record:
+                records[record["path"]] = record
+    return header, records
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # nearest-rank percentile
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def write_ranked(records, output, output_format, top_k=None):
+    scored = [record for record in records if "error" not in record]
+    scored.sort(key=lambda record: record["compatibility_score"], reverse=True)
+    if top_k is not None:
+        scored = scored[:top_k]
+
+    with open(output, "w", encoding="utf-8", newline="") as f:
+        if output_format == "csv":
+            fields = ["rank", "path", "compatibility_score", "skill_gap", "high_match_count",
+                      "partial_match_count", "missing_count", "missing_skills"]
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+            writer.writeheader()
+            for rank, record in enumerate(scored, start=1):
+                writer.writerow({**record, "rank": rank, "missing_skills": ";".join(record["missing_skills"])})
+        else:
+            for rank, record in enumerate(scored, start=1):
+                f.write(json.dumps({"rank": rank, **record}) + "\n")
+    return len(scored)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank a directory of resumes against a job description")
+    parser.add_argument("--job-desc", required=True, help="job description file (.pdf, .docx or .txt)")
+    parser.add_argument("--resumes", required=True, help="directory searched recursively for resumes")
+    parser.add_argument("--output", required=True, help="ranked output file")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="defaults to the output file extension")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--checkpoint", help="defaults to <output>.checkpoint.jsonl")
+    parser.add_argument("--fresh", action="store_true", help="discard an existing checkpoint and rescore everything")
+    parser.add_argument("--top-k", type=int)
+    args = parser.parse_args(argv)
+
+    output_format = args.format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+    checkpoint = args.checkpoint or f"{args.output}.checkpoint.jsonl"
+
+    job_desc = DocumentProcessor().process_file(args.job_desc)
+    if not job_desc["success"]:
+        print(f"❌ Could not read job description: {job_desc['error']}", file=sys.stderr)
+        return 1
+
+    fingerprint = run_fingerprint(job_desc["text"])
+    header, done = load_checkpoint(checkpoint)
+    if args.fresh or not os.path.exists(checkpoint):
+        header, done = None, {}
+    elif header != fingerprint:
+        print(f"❌ {checkpoint} was written for a different job description, model or skill taxonomy; "
+              f"pass --fresh to discard it or --checkpoint to use another file", file=sys.stderr)
+        return 1
+    paths = [path for path in find_resumes(args.resumes) if path not in done]
+    print(f"{len(done)} resumes already scored, {len(paths)} to go")
+
+    latencies = []
+    start = time.perf_counter()
+    with open(checkpoint, "a" if header else "w", encoding="utf-8") as out:
+        if not header:
+            out.write(json.dumps({"checkpoint": fingerprint}) + "\n")
+        def handle(record):
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            done[record["path"]] = record
+            latencies.append(record["latency_s"])
+            status = record.get("error") or f"{record['compatibility_score']:.1f}%"
+            print(f"[{len(latencies)}/{len(paths)}] {record['path']}: {status}")
+
+        if args.workers <= 1:
+            _init_worker(job_desc["text"])
+            for path in paths:
+                handle(_score_file(path))
+        else:
+            with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                     initargs=(job_desc["text"],)) as pool:
+                futures = [pool.submit(_score_file, path) for path in paths]
+                for future in as_completed(futures):
+                    handle(future.result())
+    elapsed = time.perf_counter() - start
+
+    written = write_ranked(done.values(), args.output, output_format, args.top_k)
+    print(f"✅ Wrote {written} ranked resumes to {args.output}")
+    if latencies:
+        print(f"Throughput: {len(latencies) / elapsed:.2f} docs/s over {elapsed:.1f}s")
+        print(f"Latency per document: p50 {percentile(latencies, 0.50):.3f}s, "
+              f"p95 {percentile(latencies, 0.95):.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
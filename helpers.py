@@ -9,10 +9,18 @@ def initialize_session_state():
         st.session_state.db = Database()  #for database
     if 'resume_data' not in st.session_state:
         st.session_state.resume_data = None   #reseume data
+    if 'indexed_resume_hash' not in st.session_state:
+        st.session_state.indexed_resume_hash = None   #last resume sent to the search indexes
     if 'job_desc_data' not in st.session_state:
         st.session_state.job_desc_data = None  #for job_description
     if 'analysis_results' not in st.session_state: 
         st.session_state.analysis_results = None   #for analysis_results
+    if 'analysis_fingerprint' not in st.session_state:
+        st.session_state.analysis_fingerprint = None   #hash of analysis_results, set together with it
+    if 'analysis_id' not in st.session_state:
+        st.session_state.analysis_id = None   #id of the saved analysis being shown
+    if 'analysis_job_id' not in st.session_state:
+        st.session_state.analysis_job_id = None   #background analysis job being polled
     if 'nlp_processor' not in st.session_state:   
         st.session_state.nlp_processor = None    #for nlp_processor
     if 'skill_analyzer' not in st.session_state:
@@ -23,3 +31,17 @@ def initialize_session_state():
         st.session_state.username = None      #for username
     if 'user_id' not in st.session_state:
         st.session_state.user_id = None         #for user_id
+
+def release_nlp_processor():
+    """Drop this session's NLPProcessor so the shared models can be evicted"""
+    if st.session_state.get("nlp_processor") is not None:
+        st.session_state.nlp_processor.close()  #release the shared models
+    st.session_state.nlp_processor = None
+    st.session_state.skill_analyzer = None
+
+def logout():
+    """Log the user out and release the models held by this session"""
+    release_nlp_processor()
+    st.session_state.authenticated = False
+    st.session_state.username = None
+    st.session_state.user_id = None
@@ -2,13 +2,30 @@
  
 import streamlit as st    #for frontend
 from backend.document_processor import DocumentProcessor  #for processing the document
-from helpers import initialize_session_state   #for real time data
+from helpers import initialize_session_state, logout   #for real time data
+
+def index_resume(text):
+    #store the resume and add it to the skill and vector indexes in the background
+    import hashlib
+    from backend.model_registry import registry
+    from backend.resume_indexing import get_indexes, reconcile, submit_resume
+    #reruns keep the file in the uploader, so only a new resume is indexed
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    if st.session_state.indexed_resume_hash == text_hash:
+        return
+    resume_id = st.session_state.db.save_document(text, "resume")
+    if resume_id is None:
+        return
+    skill_index, vector_index, index_queue = get_indexes(registry, st.session_state.db)
+    submit_resume(index_queue, skill_index, vector_index, resume_id, text)
+    st.session_state.indexed_resume_hash = text_hash
+    #also picks up resumes whose indexing was dropped earlier, e.g. on a full queue
+    reconcile(st.session_state.db, index_queue, skill_index, vector_index)
+
 def main():
     with st.sidebar:
         if st.button("🚪 Logout", use_container_width=True):
-            st.session_state.authenticated = False
-            st.session_state.username = None
-            st.session_state.user_id = None    
+            logout()
             st.rerun()
     st.markdown('<h2 class="sub-header">📁 Upload Documents</h2>', unsafe_allow_html=True)
     document_processor = DocumentProcessor()
@@ -25,6 +42,7 @@ def main():
                 
                 if result["success"]:
                     st.session_state.resume_data = result
+                    index_resume(result["text"])
                     st.success("✅ Resume processed successfully!")
                 else:
                     st.error(f"❌ Error processing resume")
@@ -1,19 +1,56 @@
 # pages/2_Skill_Analysis_and_Reports.py
 
 import streamlit as st
-import plotly.express as px
-import pandas as pd
 from backend.report_generator import ReportGenerator
 from backend.calculations import Calculations
-from helpers import initialize_session_state
+from backend.job_queue import Job, JobQueue, QueueFullError
+from helpers import initialize_session_state, logout
 from datetime import datetime
+import hashlib
+import time
 
 initialize_session_state()
 
-def create_skill_match_chart(skill_analysis):
-    high_match = skill_analysis['high_match_count']
-    partial_match = skill_analysis['partial_match_count']
-    missing = skill_analysis['missing_count']
+#builders below are memoized on the analysis fingerprint, so reruns with an
+#unchanged analysis skip them; entries are bounded per process
+ANALYSIS_CACHE_ENTRIES = 32
+SKILL_TABLE_PAGE_SIZE = 50
+#timings are recorded process-wide, so only these users see and switch the panel
+METRICS_ADMINS = {"admin"}
+
+def analysis_fingerprint(skill_analysis):
+    #stable across reruns and reloads: same matches give the same fingerprint
+    if hasattr(skill_analysis, "to_bytes"):
+        payload = skill_analysis.to_bytes()
+    else:
+        import json
+        payload = json.dumps(skill_analysis, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+def set_analysis_results(results):
+    #fingerprint once here, not on every rerun that shows the results
+    st.session_state.analysis_results = results
+    st.session_state.analysis_fingerprint = analysis_fingerprint(results["skill_analysis"]) if results else None
+
+@st.cache_data(max_entries=ANALYSIS_CACHE_ENTRIES)
+def skill_metrics(fingerprint, _skill_analysis):
+    calculations = Calculations()
+    return {
+        "total_skills": (_skill_analysis['high_match_count'] +
+                         _skill_analysis['partial_match_count'] +
+                         _skill_analysis['missing_count']),
+        "skill_gap": calculations.calculate_skill_gap(_skill_analysis),
+        "skill_coverage": calculations.calculate_skill_coverage(_skill_analysis),
+        "match_rate": _skill_analysis['overall_match'],
+    }
+
+#figures and frames are only read, so they are shared instead of copied per rerun
+@st.cache_resource(max_entries=ANALYSIS_CACHE_ENTRIES)
+def create_skill_match_chart(fingerprint, _skill_analysis):
+    import plotly.express as px  #loaded on first chart, not at page import
+    high_match = _skill_analysis['high_match_count']
+    partial_match = _skill_analysis['partial_match_count']
+    missing = _skill_analysis['missing_count']
     fig = px.pie(
         values=[high_match, partial_match, missing],
         names=['High Match', 'Partial Match', 'Missing Skills'],
@@ -22,35 +59,44 @@ def create_skill_match_chart(skill_analysis):
     )
     return fig
 
-def display_skill_table(skills, skill_type):
-    if not skills:
-        st.info(f"No {skill_type.replace('_', ' ').lower()} found.")
-        return
+#tier code of each table in SkillAnalysis.tiers, and the key holding its row count
+SKILL_TABLE_TIERS = {"matched_skills": 0, "partial_matches": 1, "missing_skills": 2}
+SKILL_TABLE_COUNTS = {"matched_skills": "high_match_count", "partial_matches": "partial_match_count",
+                      "missing_skills": "missing_count"}
+
+@st.cache_resource(max_entries=ANALYSIS_CACHE_ENTRIES * 3)
+def skill_table_frame(fingerprint, skill_type, _skill_analysis):
+    import pandas as pd
+    if hasattr(_skill_analysis, "to_dataframe"):
+        #columnar results: straight from the arrays, no per-skill dicts
+        frame = _skill_analysis.to_dataframe(SKILL_TABLE_TIERS[skill_type])
+        return pd.DataFrame({
+            "Job Skill": frame["job_skill"].astype(str),
+            "Your Skill": "Not Found" if skill_type == "missing_skills" else frame["resume_skill"].astype(str),
+            "Match Score": frame["similarity"],
+        })
     data = []
-    for skill in skills:
-        if skill_type == "matched_skills":
-            data.append({
-                "Job Skill": skill['job_skill'],
-                "Your Skill": skill['resume_skill'],
-                "Match Score": f"{skill['similarity']:.2f}",
-                
-            })
-        elif skill_type == "partial_matches":
-            data.append({
-                "Job Skill": skill['job_skill'],
-                "Your Skill": skill['resume_skill'],
-                "Match Score": f"{skill['similarity']:.2f}",
-              
-            })
+    for skill in _skill_analysis[skill_type]:
+        if skill_type == "missing_skills":
+            data.append({"Job Skill": skill['skill'], "Your Skill": "Not Found", "Match Score": skill['similarity']})
         else:
-            data.append({
-                "Job Skill": skill['skill'],
-                "Your Skill": "Not Found",
-                "Match Score": f"{skill['similarity']:.2f}",
-                
-            })
-    
-    df = pd.DataFrame(data)
+            data.append({"Job Skill": skill['job_skill'], "Your Skill": skill['resume_skill'],
+                         "Match Score": skill['similarity']})
+    return pd.DataFrame(data)
+
+def display_skill_table(fingerprint, skill_analysis, skill_type):
+    if not skill_analysis[SKILL_TABLE_COUNTS[skill_type]]:
+        st.info(f"No {skill_type.replace('_', ' ').lower()} found.")
+        return
+    df = skill_table_frame(fingerprint, skill_type, skill_analysis)
+    #only one page of rows is sent to the browser, however long the list
+    if len(df) > SKILL_TABLE_PAGE_SIZE:
+        pages = (len(df) - 1) // SKILL_TABLE_PAGE_SIZE + 1
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1,
+                               key=f"{skill_type}_page_{fingerprint[:16]}")
+        start = (page - 1) * SKILL_TABLE_PAGE_SIZE
+        st.caption(f"Showing {start + 1}–{min(start + SKILL_TABLE_PAGE_SIZE, len(df))} of {len(df)}")
+        df = df.iloc[start:start + SKILL_TABLE_PAGE_SIZE]
     st.dataframe(
         df,
         use_container_width=True,
@@ -68,67 +114,184 @@ def display_skill_table(skills, skill_type):
         }
     )
 
-def display_skill_summary(skill_analysis):
-    calculations = Calculations()
-    
+def display_skill_summary(metrics):
     st.subheader("📋 Skill Analysis Summary")
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        total_skills = (skill_analysis['high_match_count'] + 
-                       skill_analysis['partial_match_count'] + 
-                       skill_analysis['missing_count'])
-        st.metric("Total Skills Required", total_skills)
+        st.metric("Total Skills Required", metrics["total_skills"])
     with col2:
-        skill_gap = calculations.calculate_skill_gap(skill_analysis)
-        st.metric("Skill Gap", f"{skill_gap:.1f}%")
+        st.metric("Skill Gap", f"{metrics['skill_gap']:.1f}%")
     with col3:
-        coverage = calculations.calculate_skill_coverage(skill_analysis)
-        st.metric("Skill Coverage", f"{coverage:.1f}%")
+        st.metric("Skill Coverage", f"{metrics['skill_coverage']:.1f}%")
     with col4:
-        match_rate = skill_analysis['overall_match']
-        st.metric("Match Rate", f"{match_rate:.1f}%")
+        st.metric("Match Rate", f"{metrics['match_rate']:.1f}%")
+
+HISTORY_PAGE_SIZE = 10
+
+def display_analysis_history():
+    user_id = st.session_state.user_id
+    if user_id is None:
+        return
+    db = st.session_state.db
+    st.subheader("🕘 Analysis History")
+    #keyset pagination: remember the last id shown on each page
+    if 'history_cursor' not in st.session_state:
+        st.session_state.history_cursor = [None]
+    history = db.get_analysis_history(user_id, limit=HISTORY_PAGE_SIZE,
+                                      before_id=st.session_state.history_cursor[-1])
+    if not history and len(st.session_state.history_cursor) == 1:
+        st.caption("No saved analyses yet.")
+        return
+    for entry in history:
+        label = f"{entry['created_at']} · {entry['compatibility_score']:.1f}%"
+        if st.button(label, key=f"history_{entry['id']}", use_container_width=True):
+            #reopen the stored report without recomputing anything
+            set_analysis_results(db.get_analysis(entry['id'], user_id))
+            st.session_state.analysis_id = entry['id']
+            st.rerun()
+    col1, col2 = st.columns(2)
+    with col1:
+        if len(st.session_state.history_cursor) > 1 and st.button("⬅ Newer", use_container_width=True):
+            st.session_state.history_cursor.pop()
+            st.rerun()
+    with col2:
+        if len(history) == HISTORY_PAGE_SIZE and st.button("Older ➡", use_container_width=True):
+            st.session_state.history_cursor.append(history[-1]['id'])
+            st.rerun()
+    missing = db.get_most_missing_skills(user_id, limit=5)
+    if missing:
+        st.markdown("**Most missing skills across your analyses:**")
+        for skill, count in missing:
+            st.markdown(f"- {skill} ({count}×)")
+
+def display_metrics_panel():
+    if st.session_state.username not in METRICS_ADMINS:
+        return
+    import pandas as pd
+    from backend import instrumentation
+    with st.expander("🛠 Performance Metrics"):
+        enabled = st.toggle("Record stage timings (all sessions)", value=instrumentation.is_enabled())
+        if enabled != instrumentation.is_enabled():
+            if enabled:
+                instrumentation.enable()
+            else:
+                instrumentation.disable()
+        snapshot = instrumentation.metrics.snapshot()
+        if not snapshot["stages"]:
+            st.caption("No timings recorded yet.")
+            return
+        rows = [{
+            "Stage": name,
+            "Calls": entry["count"],
+            "Total (s)": round(entry["seconds"], 4),
+            "Mean (ms)": round(entry["seconds"] / entry["count"] * 1000, 2),
+            "Max (ms)": round(entry["max_seconds"] * 1000, 2),
+            "Input size": entry["input_size"]
+        } for name, entry in sorted(snapshot["stages"].items(), key=lambda item: -item[1]["seconds"])]
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+        for event, value in sorted(snapshot["counters"].items()):
+            st.caption(f"{event}: {value}")
+        st.download_button("Export Prometheus metrics", instrumentation.metrics.to_prometheus(),
+                           file_name="skill_analyzer_metrics.prom", mime="text/plain")
 
 def main():
     calculations = Calculations()
     with st.sidebar:
         if st.button("🚪 Logout", use_container_width=True):
-            st.session_state.authenticated = False
-            st.session_state.username = None
-            st.session_state.user_id = None
+            logout()
             st.rerun()
+        display_analysis_history()
+        display_metrics_panel()
     st.markdown('<h2 class="sub-header">🔍 Skill Analysis & Report</h2>', unsafe_allow_html=True)
-    if not st.session_state.resume_data or not st.session_state.job_desc_data:
+    has_documents = st.session_state.resume_data and st.session_state.job_desc_data
+    if not has_documents and not st.session_state.analysis_results:
         st.warning("⚠️ Please upload both resume and job description first.")
         return
+    if has_documents:
+        run_analysis_controls()
+    if not st.session_state.analysis_results:
+        st.info("👆 Click the button above to run the skill gap analysis")
+        return
+    show_analysis_results(calculations)
+
+def run_analysis_controls():
     if st.session_state.nlp_processor is None:
         try:
+            from backend.model_registry import registry
             from backend.nlp_processor import NLPProcessor
+            from backend.result_cache import load_shared_cache
             from backend.skill_analyzer import SkillAnalyzer
             st.session_state.nlp_processor = NLPProcessor()
-            st.session_state.skill_analyzer = SkillAnalyzer(st.session_state.nlp_processor)
+            st.session_state.skill_analyzer = SkillAnalyzer(
+                st.session_state.nlp_processor,
+                cache=registry.get("analysis_cache", load_shared_cache)  #shared by every session
+            )
         except Exception as e:
             st.error(f"Error initializing NLP components: {e}")
             return
-    if st.button("🔍 Run Skill Gap Analysis", type="primary", use_container_width=True):
-        with st.spinner("Analyzing documents..."):
-            try:
-                st.session_state.analysis_results = st.session_state.skill_analyzer.analyze_skill_gap(
-                    st.session_state.resume_data['text'],
-                    st.session_state.job_desc_data['text']
-                )
-                st.success("✅ Analysis completed successfully!")
-                    
-            except Exception as e:
-                st.error(f"❌ Error during analysis: {e}")
-                return
-    if not st.session_state.analysis_results:
-        st.info("👆 Click the button above to run the skill gap analysis")
+    job_queue = registry_job_queue()
+    job = job_queue.get(st.session_state.analysis_job_id) if st.session_state.analysis_job_id else None
+    running = job is not None and not job.finished
+    if st.button("🔍 Run Skill Gap Analysis", type="primary", use_container_width=True, disabled=running):
+        resume_text = st.session_state.resume_data['text']
+        job_desc_text = st.session_state.job_desc_data['text']
+        #identical documents share one in-flight job
+        key = hashlib.sha256(f"{resume_text}\0{job_desc_text}".encode("utf-8")).hexdigest()
+        try:
+            job = job_queue.submit(
+                st.session_state.skill_analyzer.analyze_skill_gap,
+                resume_text, job_desc_text, key=key
+            )
+            st.session_state.analysis_job_id = job.id
+            running = True
+        except QueueFullError:
+            st.warning("⏳ The server is busy with other analyses. Please try again in a moment.")
+            return
+    if job is None:
         return
-    
+    if running:
+        st.progress(job.progress, text=f"Analyzing documents... {job.message}")
+        if st.button("✖ Cancel Analysis"):
+            #other sessions may share the job, so only stop following it here
+            job_queue.cancel(job.id)
+            st.session_state.analysis_job_id = None
+            st.info("Analysis cancelled.")
+            return
+        #poll the background job without holding the script thread
+        time.sleep(0.5)
+        st.rerun()
+    st.session_state.analysis_job_id = None
+    if job.status == Job.DONE:
+        set_analysis_results(job.result)
+        #persist so the report survives a refresh or logout
+        if st.session_state.user_id is not None:
+            st.session_state.analysis_id = st.session_state.db.save_analysis(
+                st.session_state.user_id,
+                st.session_state.resume_data['text'],
+                st.session_state.job_desc_data['text'],
+                st.session_state.analysis_results
+            )
+        st.success("✅ Analysis completed successfully!")
+    elif job.status == Job.FAILED:
+        st.error(f"❌ Error during analysis: {job.error}")
+    else:
+        st.info("Analysis cancelled.")
+
+def registry_job_queue():
+    from backend.model_registry import registry
+    #one bounded executor shared by every session on this server
+    return registry.get("job_queue", JobQueue)
+
+def show_analysis_results(calculations):
     analysis = st.session_state.analysis_results
     skill_analysis = analysis["skill_analysis"]
-    skill_gap = calculations.calculate_skill_gap(skill_analysis)
-    skill_coverage = calculations.calculate_skill_coverage(skill_analysis)
+    fingerprint = st.session_state.analysis_fingerprint
+    if fingerprint is None:
+        set_analysis_results(analysis)
+        fingerprint = st.session_state.analysis_fingerprint
+    metrics = skill_metrics(fingerprint, skill_analysis)
+    skill_gap = metrics["skill_gap"]
+    skill_coverage = metrics["skill_coverage"]
     st.subheader("🎯 Overall Assessment")
     
     compatibility_score = analysis['compatibility_score']
@@ -154,29 +317,29 @@ def main():
     else:
         st.error(assessment_message)
   
-    display_skill_summary(skill_analysis)
+    display_skill_summary(metrics)
     
     st.subheader("📈 Visual Analysis")
     
-    fig = create_skill_match_chart(skill_analysis)
+    fig = create_skill_match_chart(fingerprint, skill_analysis)
     st.plotly_chart(fig, use_container_width=True)
     
     st.subheader("🔎 Detailed Skill Analysis")
     
     with st.expander(f"✅ High Matches ({skill_analysis['high_match_count']} skills)", expanded=True):
         st.write("**Skills where you have strong matching experience:**")
-        display_skill_table(skill_analysis['matched_skills'], "matched_skills")
+        display_skill_table(fingerprint, skill_analysis, "matched_skills")
     
     with st.expander(f"⚠️ Partial Matches ({skill_analysis['partial_match_count']} skills)"):
         st.write("**Skills where you have some experience but could improve:**")
-        display_skill_table(skill_analysis['partial_matches'], "partial_matches")
+        display_skill_table(fingerprint, skill_analysis, "partial_matches")
     
     with st.expander(f"❌ Missing Skills ({skill_analysis['missing_count']} skills)"):
         st.write("**Skills required for the job that are missing from your resume:**")
-        display_skill_table(skill_analysis['missing_skills'], "missing_skills")
+        display_skill_table(fingerprint, skill_analysis, "missing_skills")
     
     st.subheader("📄 Download Report")
-    st.info("📝 Download the pdf for future reference as the data will be lost when you refresh or logout")
+    st.info("📝 Your analyses are saved to your account; reopen them any time from Analysis History in the sidebar")
     if st.session_state.analysis_results:
         if st.button("Generate PDF Report", type="primary"):
             with st.spinner("Creating report..."):